@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+
+from style_validation import StyleError, ValidationResult, Validators, _validators, validate_style
+
+
+def _load_and_validate(path: Path, validators: Validators):
+    try:
+        text = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as err:
+        return ValidationResult(errors=[StyleError(0, None, str(err))])
+    return validate_style(text, validators)
+
+
+async def load_styles(paths: Iterable[Path], concurrency: int = 8, executor: Executor | None = None, validators: Validators = _validators) -> AsyncIterator[tuple[Path, ValidationResult]]:
+    """Reads and validates .mplstyle or matplotlibrc files in `executor` (default: the loop's default executor)
+    and yields `(path, result)` in completion order. At most `concurrency` files are processed at a time.
+
+    Files that cannot be read are reported as a `StyleError` with `line_no` 0. Closing the iterator or cancelling
+    the consuming task cancels the files that have not started yet.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+    loop = asyncio.get_running_loop()
+    remaining = iter(paths)
+    running: dict[asyncio.Future[ValidationResult], Path] = {}
+
+    def submit():
+        for path in remaining:
+            running[loop.run_in_executor(executor, _load_and_validate, Path(path), validators)] = Path(path)
+            if len(running) >= concurrency:
+                return
+
+    try:
+        submit()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), future.result()
+            submit()
+    finally:
+        for future in running:
+            future.cancel()
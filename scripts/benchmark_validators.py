@@ -0,0 +1,116 @@
+"""Feeds the validators in `matplotlib.rcsetup` inputs of growing size and fails if any of them scales worse than linearly."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import matplotlib.rcsetup as rcsetup
+import numpy as np
+
+
+@dataclass
+class Case:
+    name: str
+    validator: str
+    """The name of the validator in `matplotlib.rcsetup`"""
+    make_input: Callable[[int], str]
+    """Returns an input with about n elements"""
+
+
+cases = [
+    # `allow_stringlist` falls back to validating the string character by character after the comma-separated list fails
+    Case("colorlist single-letter fallback", "validate_colorlist", lambda n: "rgbcmyk" * (n // 7)),
+    Case("colorlist failing at the end", "validate_colorlist", lambda n: "red, " * n + "notacolor"),
+    Case("cycler", "validate_cycler", lambda n: "cycler(color=[" + "'r', " * n + "])"),
+    Case("cycler with several properties", "validate_cycler", lambda n: "cycler(color=[" + "'r', " * n + "], linewidth=[" + "1, " * n + "])"),
+    Case("linestyle on-off sequence", "_validate_linestyle", lambda n: "(0, (" + "1, 2, " * n + "))"),
+    Case("color tuple literal", "validate_color", lambda n: "(" + "0.5, " * n + ")"),
+    Case("legend.loc tuple literal", "_validate_legend_loc", lambda n: "(" + "0.5, " * n + ")"),
+    Case("sketch", "validate_sketch", lambda n: "(" + "1, " * n + ")"),
+    Case("floatlist", "validate_floatlist", lambda n: "1.5, " * n),
+    Case("font family list", "validate_stringlist", lambda n: "DejaVu Sans, " * n),
+]
+
+
+def measure(validator: Callable[[Any], Any], value: str, repeat: int):
+    """The best of `repeat` runs, in seconds. Validation errors are expected for some inputs and are ignored."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            validator(value)
+        except (ValueError, TypeError):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@dataclass
+class Result:
+    name: str
+    validator: str
+    sizes: list[int]
+    seconds: list[float]
+    exponent: float
+    """The median over the rounds of the slope of log(time) against log(size) over the larger half of the sizes"""
+    exponents: list[float]
+    """The slope of each round"""
+    passed: bool
+
+
+def run_case(case: Case, sizes: list[int], repeat: int, rounds: int, max_exponent: float):
+    """Measures every size in each of `rounds` rounds and fits each round separately, so that a burst of load on a
+    shared machine skews one fit rather than the result."""
+    validator = getattr(rcsetup, case.validator)
+    inputs = [case.make_input(n) for n in sizes]
+    fit = len(sizes) // 2
+    timings: list[list[float]] = []
+    exponents: list[float] = []
+    for _ in range(rounds):
+        seconds = [measure(validator, value, repeat) for value in inputs]
+        timings.append(seconds)
+        exponents.append(float(np.polyfit(np.log(sizes[fit:]), np.log(seconds[fit:]), 1)[0]))
+    seconds = np.min(timings, axis=0).tolist()
+    exponent = float(np.median(exponents))
+    return Result(case.name, case.validator, sizes, seconds, exponent, exponents, exponent <= max_exponent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--min-size", type=int, default=2 ** 8)
+    parser.add_argument("--max-size", type=int, default=2 ** 15)
+    parser.add_argument("--repeat", type=int, default=9, help="runs per size and round, the fastest one is used (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=5, help="independent fits per case, the median exponent is used (default: %(default)s)")
+    # Single rounds of linear validators fit anywhere up to ~1.45 on a busy machine, but their medians stay below ~1.15
+    parser.add_argument("--max-exponent", type=float, default=1.3, help="the largest median growth exponent that still counts as linear (default: %(default)s)")
+    parser.add_argument("--json", type=Path, help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    sizes: list[int] = []
+    n = args.min_size
+    while n <= args.max_size:
+        sizes.append(n)
+        n *= 2
+
+    results: list[Result] = []
+    for case in cases:
+        if not hasattr(rcsetup, case.validator):
+            print(f"skip  {case.name}: matplotlib.rcsetup.{case.validator} does not exist in this version", file=sys.stderr)
+            continue
+        result = run_case(case, sizes, args.repeat, args.rounds, args.max_exponent)
+        results.append(result)
+        print(f"{'ok' if result.passed else 'FAIL':5} {result.name}: n^{result.exponent:.2f} (rounds: {', '.join(f'{e:.2f}' for e in result.exponents)}), {result.seconds[-1] * 1000:.2f} ms at n={sizes[-1]}")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2))
+    if not all(r.passed for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
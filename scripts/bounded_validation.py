@@ -0,0 +1,102 @@
+"""Validation with resource limits for untrusted styles.
+
+`bounded_validators(limits)` wraps every validator so that over-limit strings are rejected with a linear scan before
+they reach `ast.parse`, `eval` or `ast.literal_eval` in `validate_cycler`, `validate_color`, `_validate_linestyle`, etc.
+The wrapped table can be passed as `validators` to `validate_style`, `validate_concurrently` and `load_styles`.
+"""
+from __future__ import annotations
+
+import re
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from style_validation import Validators, _validators, validate_style
+
+
+@dataclass(frozen=True)
+class Limits:
+    max_value_length: int = 10_000
+    """The maximum number of characters of a value"""
+    max_list_length: int = 1_000
+    """The maximum number of comma-separated items of a value, which bounds the length of any list or tuple in it"""
+    max_ast_nodes: int = 5_000
+    """The maximum number of tokens of a value, which bounds the number of AST nodes a parser can produce from it"""
+    time_budget: float | None = None
+    """Seconds per value, off by default. Only interrupts a validator on the main thread of Unix. On worker threads, e.g. in
+    `validate_concurrently` and `load_styles`, a value over budget still runs to completion and is rejected afterwards."""
+
+
+class LimitExceeded(ValueError):
+    pass
+
+
+_token = re.compile(r"""[A-Za-z_]\w*|\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|'[^']*'|"[^"]*"|\S""")
+
+
+def check_limits(value: str, limits: Limits):
+    """Raises `LimitExceeded` if `value` is over one of the limits. Runs in time linear in the length of `value`, which is checked first."""
+    if len(value) > limits.max_value_length:
+        raise LimitExceeded(f"The value is longer than {limits.max_value_length} characters")
+    if value.count(",") + 1 > limits.max_list_length:
+        raise LimitExceeded(f"The value has more than {limits.max_list_length} items")
+    tokens = 0
+    for _ in _token.finditer(value):
+        tokens += 1
+        if tokens > limits.max_ast_nodes:
+            raise LimitExceeded(f"The value has more than {limits.max_ast_nodes} tokens")
+
+
+@contextmanager
+def _deadline(seconds: float | None):
+    if seconds is None:
+        yield
+        return
+    preemptive = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if preemptive:
+        def on_timeout(signum: int, frame: Any):
+            raise LimitExceeded(f"Validation took longer than {seconds} seconds")
+        previous = signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if preemptive:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    if time.perf_counter() - start > seconds:
+        raise LimitExceeded(f"Validation took longer than {seconds} seconds")
+
+
+def bound(validator: Callable[[Any], Any], limits: Limits):
+    def f(s: Any):
+        if isinstance(s, str):
+            check_limits(s, limits)
+        with _deadline(limits.time_budget):
+            return validator(s)
+    f.__name__ = getattr(validator, "__name__", type(validator).__name__)
+    f.__doc__ = validator.__doc__
+    return f
+
+
+def bounded_validators(limits: Limits = Limits(), validators: Validators = _validators) -> dict[str, Callable[[Any], Any]]:
+    return {k: bound(v, limits) for k, v in validators.items()}
+
+
+@lru_cache
+def _default_bounded_validators(limits: Limits):
+    return bounded_validators(limits)
+
+
+def validate_untrusted_style(text: str, limits: Limits = Limits()):
+    """Same as `validate_style`, with the limits applied to every value.
+
+    The length, item and token limits are checked before a validator runs, so they are the only bound on the work done
+    per value off the main thread. See `Limits.time_budget`.
+    """
+    return validate_style(text, _default_bounded_validators(limits))
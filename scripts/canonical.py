@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import re
+from numbers import Real
+from typing import Any, Callable
+
+import matplotlib.colors
+import numpy as np
+from cycler import Cycler
+from matplotlib.rcsetup import _prop_aliases, _prop_validators, _validators  # type: ignore
+
+
+def is_color_validator(validator: Callable[[Any], Any] | None):
+    """e.g. validate_color, validate_color_or_auto, validate_colorlist"""
+    if validator is None:
+        return False
+    return "color" in getattr(validator, "__name__", type(validator).__name__)
+
+
+def canonical_color(value: Any):
+    # `C0`, `C1`, ... refer to the current prop cycle and cannot be resolved statically
+    if isinstance(value, str) and re.fullmatch(r"C\d+", value):
+        return value
+    try:
+        return matplotlib.colors.to_rgba(value)
+    except ValueError:
+        return value
+
+
+def canonical(value: Any, color: bool = False) -> Any:
+    """Converts a validated value into a hashable value that compares equal to the other spellings of the same setting,
+    e.g. `'red'` and `'#FF0000'` both become `(1.0, 0.0, 0.0, 1.0)` when `color` is true."""
+    if isinstance(value, Cycler):
+        by_key = {_prop_aliases.get(k, k): v for k, v in value.by_key().items()}
+        return ("cycler", tuple(sorted((k, canonical(v, is_color_validator(_prop_validators.get(k)))) for k, v in by_key.items())))
+    if isinstance(value, str):
+        return canonical_color(value) if color else value
+    if isinstance(value, (list, tuple, np.ndarray)):
+        if color and len(value) in (3, 4) and all(isinstance(v, Real) for v in value):
+            return canonical_color(tuple(value))
+        return tuple(canonical(v, color) for v in value)
+    return value
+
+
+def canonical_value(key: str, value: Any):
+    return canonical(value, is_color_validator(_validators.get(key)))
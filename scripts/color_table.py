@@ -0,0 +1,72 @@
+"""A packed binary table of named colors, written next to colors.json.
+
+Layout (little-endian):
+    magic       b"MPLC"
+    version     uint32
+    count       uint32
+    rgba        float16[count][4]    rows in the order of the names
+    offsets     uint32[count + 1]    byte offsets of the names in the blob
+    names       utf-8 blob           names sorted by their utf-8 bytes, so that they can be binary searched
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, Mapping
+
+import numpy as np
+
+MAGIC = b"MPLC"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+
+
+def pack_color_table(colors: Mapping[str, Iterable[float]]):
+    names = sorted(colors, key=lambda name: name.encode())
+    encoded = [name.encode() for name in names]
+    rgba = np.array([list(colors[name]) for name in names], dtype="<f2").reshape(-1, 4)
+    offsets = np.zeros(len(names) + 1, dtype="<u4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return HEADER.pack(MAGIC, VERSION, len(names)) + rgba.tobytes() + offsets.tobytes() + b"".join(encoded)
+
+
+class ColorTable:
+    """Reads a table written by `pack_color_table` without parsing the whole file. Lookups are binary searches over the memory-mapped name index."""
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} color table")
+        self._rgba = np.frombuffer(self._buf, dtype="<f2", count=self.count * 4, offset=HEADER.size).reshape(-1, 4)
+        self._offsets = np.frombuffer(self._buf, dtype="<u4", count=self.count + 1, offset=HEADER.size + self._rgba.nbytes)
+        self._names_start = HEADER.size + self._rgba.nbytes + self._offsets.nbytes
+
+    def __len__(self):
+        return self.count
+
+    def _name(self, i: int):
+        return self._buf[self._names_start + int(self._offsets[i]):self._names_start + int(self._offsets[i + 1])]
+
+    def _index(self, name: str):
+        target = name.encode()
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.count and self._name(lo) == target else None
+
+    def __contains__(self, name: str):
+        return self._index(name) is not None
+
+    def get(self, name: str) -> tuple[float, float, float, float] | None:
+        i = self._index(name)
+        return None if i is None else tuple(float(x) for x in self._rgba[i])  # type: ignore
+
+    def names(self):
+        return [self._name(i).decode() for i in range(self.count)]
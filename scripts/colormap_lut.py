@@ -0,0 +1,42 @@
+"""Sampled colormaps, written next to cm.json as cm_lut.json.
+
+{"size": N, "names": [...], "rgba": "<base64>"}, where "rgba" is a uint8 array of shape (len(names), N, 4)
+holding each colormap sampled at N evenly spaced points in [0, 1], in the order of "names".
+"""
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+from typing import Mapping
+
+import numpy as np
+from matplotlib.colors import Colormap
+
+LUT_SIZE = 64
+
+
+def sample_colormaps(cmaps: Mapping[str, Colormap], size: int = LUT_SIZE):
+    x = np.linspace(0.0, 1.0, size)
+    names = list(cmaps.keys())
+    return names, np.stack([cmaps[name](x, bytes=True) for name in names]).reshape(len(names), size, 4)
+
+
+def pack_colormap_luts(cmaps: Mapping[str, Colormap], size: int = LUT_SIZE):
+    names, rgba = sample_colormaps(cmaps, size)
+    return json.dumps({"size": size, "names": names, "rgba": base64.b64encode(rgba.tobytes()).decode()}, separators=(',', ':'))
+
+
+class ColormapLUTs:
+    def __init__(self, path: Path):
+        data = json.loads(path.read_text())
+        self.size: int = data["size"]
+        self.index = {name: i for i, name in enumerate(data["names"])}
+        self.rgba = np.frombuffer(base64.b64decode(data["rgba"]), dtype=np.uint8).reshape(len(self.index), self.size, 4)
+
+    def __contains__(self, name: str):
+        return name in self.index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Returns the (size, 4) uint8 RGBA samples of the colormap."""
+        return self.rgba[self.index[name]]
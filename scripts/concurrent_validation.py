@@ -0,0 +1,46 @@
+"""Validates many styles on a thread pool.
+
+Thread safety: the validators in `matplotlib.rcsetup._validators` do not share mutable state. `_validators` itself is
+only read, the only mutations done by validators are `validate_cycler` renaming the keys of a `Cycler` it was given
+(strings are parsed into a fresh `Cycler` on every call), and the filling of the `functools.lru_cache` around `_listify_validator`.
+That cache is also populated at validation time, as `validate_whiskers` and `validate_sketch` call
+`_listify_validator(validate_float, n=2)` and `n=3` on every value, but `lru_cache` is thread-safe and a racing miss at worst
+builds an equivalent validator twice. Nothing in this module or `style_validation` is cached, so the pool needs no locks
+and scales across cores on free-threaded (no-GIL) builds of CPython.
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from style_validation import ValidationResult, Validators, _validators, validate_style
+
+
+def validate_concurrently(styles: Iterable[str], max_workers: int | None = None, max_pending: int | None = None, validators: Validators = _validators) -> Iterator[ValidationResult]:
+    """Validates the contents of .mplstyle or matplotlibrc files on a thread pool and yields the results in the input order.
+
+    `styles` is consumed lazily and at most `max_pending` styles (default: 4 per worker) are queued or running at a time,
+    so that a slow consumer or a large input does not buffer the whole corpus in memory.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 4 * max_workers
+    if max_pending < 1:
+        raise ValueError(f"max_pending must be positive, got {max_pending}")
+
+    pending: deque[Future[ValidationResult]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="validate") as executor:
+        try:
+            for text in styles:
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(validate_style, text, validators))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Do not run the queued styles when the consumer stops early
+            for future in pending:
+                future.cancel()
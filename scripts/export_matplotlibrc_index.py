@@ -0,0 +1,231 @@
+"""Exports the documentation of the sample matplotlibrc as a JSON index, so that the extension does not have to parse it on activation.
+
+The comments are extracted in the same way as `src/sample-matplotlibrc-parser.ts`, and the example values are validated with
+`matplotlib.rcsetup._validators`. The output has the form
+
+    {
+        "sections": [{"title": "LINES", "body": "..."}, ...],
+        "params": {"lines.linewidth": {"exampleValue": "1.5", "default": 1.5, "comment": "...", "section": 1}, ...},
+        "errors": ["...", ...]
+    }
+
+where `default` is the validated example value as JSON (null if it could not be validated, see `errors`) and `section` is an index into `sections`
+or null. The section is not repeated in `comment`: `sample-matplotlibrc-parser.ts` shows the comment of a key followed by
+"\n\n---\n#### {title}\n{body}" of its section, or the latter alone if the comment is empty.
+"""
+from __future__ import annotations
+
+import argparse
+import enum
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from cycler import Cycler
+from matplotlib.rcsetup import _validators  # type: ignore
+
+from style_validation import Validators
+
+matplotlibrc_path = Path(__file__).parent.parent / "matplotlib/lib/matplotlib/mpl-data/matplotlibrc"
+out_path = Path(__file__).parent.parent / "matplotlib/matplotlibrc.json"
+
+
+@dataclass
+class Section:
+    title: str
+    body: str
+
+
+@dataclass
+class _Subheading:
+    """Comment lines followed by the keys they describe"""
+    body: list[str] = field(default_factory=list)
+    target: list[str] = field(default_factory=list)
+
+    def lines(self):
+        if not self.body:
+            return []
+        return [*self.body, *([] if len(self.target) <= 1 else ["", *(f"- {v}" for v in self.target)])]
+
+
+@dataclass
+class Param:
+    example_value: str
+    comment_start: list[str]
+    subheading: _Subheading
+    section: int | None
+
+    def comment(self):
+        """The comment of the key formatted as Markdown, in the same way as `sample-matplotlibrc-parser.ts` but without
+        the section, which is stored once in `sections`."""
+        parts = [self.comment_start, self.subheading.lines()]
+        lines: list[str] = []
+        for i, part in enumerate(p for p in parts if p):
+            lines += ([] if i == 0 else ["", "---"]) + part
+        return "\n".join(lines)
+
+
+def _find_comment_start(s: str):
+    inside_double_quote = False
+    for i, c in enumerate(s):
+        if c == '"':
+            inside_double_quote = not inside_double_quote
+        if not inside_double_quote and c == "#":
+            return i
+    return None
+
+
+def _parse_line(line: str) -> tuple[str, str | None, int | None] | None:
+    """Returns the key, the value and the position of the comment in the same way as `parseLine` in `mplstyle-parser.ts`."""
+    comment_start = _find_comment_start(line)
+    if comment_start is not None:
+        line = line[:comment_start]
+    if line.strip() == "":
+        return None
+    key, colon, value = line.partition(":")
+    if not colon:
+        return key.strip(), None, comment_start
+    value = value.strip()
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+    return key.strip(), value, comment_start
+
+
+def parse_matplotlibrc(content: str):
+    """Parses the comments and the example values of the sample matplotlibrc. Returns the sections and the keys in the order of the file."""
+    sections: list[Section] = []
+    params: dict[str, Param] = {}
+    last_key: str | None = None
+    section: int | None = None
+    section_buf: Section | None = None
+    subheading = _Subheading()
+
+    lines = content.replace("\r", "").split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+
+        # Uncomment the line
+        if line.startswith("#"):
+            line = line[1:]  # `#webagg.port: 8988`
+        if re.match(r"#\w", line):
+            line = line[1:]  # `##backend: Agg`
+
+        if line.startswith("# *******"):
+            continue
+
+        if section_buf is not None:
+            # The body of a section header
+            # ```
+            # ## **********
+            # ## * title  *
+            # ## **********
+            # ## body
+            # ```
+            if line.startswith("# "):
+                section_buf.body += line[len("# "):] + "\n"
+                continue
+            if section_buf.body == "":
+                section = None
+            else:
+                sections.append(section_buf)
+                section = len(sections) - 1
+            section_buf = None
+            i -= 1
+            continue
+
+        if line.startswith("# * "):
+            section_buf = Section(line[len("# * "):-1].strip(), "")
+            subheading = _Subheading()
+            continue
+
+        if line.strip() == "":
+            subheading = _Subheading()
+            continue
+
+        # Comment lines above a group of keys
+        if line.startswith("# "):
+            if subheading.target:
+                subheading = _Subheading()
+            subheading.body.append(line[len("# "):])
+            continue
+
+        # Multi-line trailing comments
+        # ```
+        # key: value  # a
+        #             # b
+        # ```
+        if re.match(r" +#", line) and last_key is not None:
+            params[last_key].comment_start.append(line.split("#")[1].lstrip())
+            continue
+
+        if line.startswith(("#", " ")):
+            subheading = _Subheading()
+            continue
+
+        pair = _parse_line(line)
+        if pair is None:
+            continue
+        key, value, comment_start = pair
+        if value is None:
+            print(f"Parse error: {line}", file=sys.stderr)
+            continue
+
+        subheading.target.append(key)
+        params[key] = Param(value, [] if comment_start is None else [line[comment_start + 1:].strip()], subheading, section)
+        last_key = key
+
+    return sections, params
+
+
+def to_json(value: Any) -> Any:
+    """Converts a validated value into JSON. Cyclers become `{"cycler": {property: [values]}}` and other objects their `str()`."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Cycler):
+        return {"cycler": {k: to_json(v) for k, v in value.by_key().items()}}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, enum.Enum):
+        return value.name
+    return str(value)
+
+
+def export_index(content: str, validators: Validators = _validators):
+    sections, params = parse_matplotlibrc(content)
+    index: dict[str, Any] = {"sections": [{"title": s.title, "body": s.body} for s in sections], "params": {}, "errors": []}
+    for key, param in params.items():
+        default = None
+        validator: Callable[[Any], Any] | None = validators.get(key)
+        if validator is None:
+            index["errors"].append(f"{key}: unknown key")
+        else:
+            try:
+                default = to_json(validator(param.example_value))
+            except Exception as err:
+                index["errors"].append(f"{key}: {err}")
+        index["params"][key] = {"exampleValue": param.example_value, "default": default, "comment": param.comment(), "section": param.section}
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matplotlibrc", type=Path, default=matplotlibrc_path, help="(default: %(default)s)")
+    parser.add_argument("--out", type=Path, default=out_path, help="(default: %(default)s)")
+    args = parser.parse_args()
+
+    index = export_index(args.matplotlibrc.read_text(encoding="utf-8"))
+    for error in index["errors"]:
+        print(error, file=sys.stderr)
+    args.out.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Drop-in replacements for `matplotlib.rcsetup.cycler` and `matplotlib.rcsetup.validate_cycler` that build
+multi-property cyclers in one step instead of `reduce(operator.add, ...)` over one cycler per property."""
+from __future__ import annotations
+
+import ast
+from typing import Any
+
+from cycler import Cycler, concat
+from matplotlib.rcsetup import _prop_aliases, _prop_validators  # type: ignore
+
+
+class ColumnarCycler(Cycler):
+    """A flat `Cycler` that also keeps its values by key, so that `by_key()` does not iterate over the whole cycle.
+    Instances are only created from property names and values that have already been normalized and validated."""
+
+    def __init__(self, columns: dict[str, list[Any]]):
+        lengths = {k: len(v) for k, v in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Can only add equal length cycles, not {lengths}")
+        super().__init__(None)
+        self._set_columns(columns)
+        self.validated = True
+        """False after `+=` or `*=` with a cycler that is not a `ColumnarCycler`, whose values were not validated"""
+
+    def _set_columns(self, columns: dict[str, list[Any]]):
+        self._columns = columns
+        self._keys = set(columns)
+        self._left = [dict(zip(columns, row)) for row in zip(*columns.values())]
+        self._right = None
+        self._op = None
+
+    def by_key(self):
+        return {k: list(v) for k, v in self._columns.items()}
+
+    def change_key(self, old, new):
+        if old == new:
+            return
+        if new in self._keys:
+            raise ValueError(f"Can't replace {old} with {new}, {new} is already a key")
+        if old not in self._keys:
+            raise KeyError(f"Can't replace {old} with {new}, {old} is not a key")
+        # `Cycler.change_key` assumes that a flat cycler has a single key
+        self._set_columns({(new if k == old else k): v for k, v in self._columns.items()})
+
+    # `Cycler.__iadd__` and `__imul__` nest `self` into `_left`, which would leave `_columns` stale. The result is
+    # flattened back into columns instead.
+    def __iadd__(self, other):
+        if not isinstance(other, Cycler):
+            raise TypeError("Cannot += with a non-Cycler object")
+        self._set_columns(Cycler.__add__(self, other).by_key())
+        self.validated = self.validated and isinstance(other, ColumnarCycler) and other.validated
+        return self
+
+    def __imul__(self, other):
+        if not isinstance(other, Cycler):
+            raise TypeError("Cannot *= with a non-Cycler object")
+        self._set_columns(Cycler.__mul__(self, other).by_key())
+        self.validated = self.validated and isinstance(other, ColumnarCycler) and other.validated
+        return self
+
+    def __repr__(self):
+        # `Cycler.__repr__` prints a single key of a flat cycler
+        if len(self._columns) == 1:
+            return super().__repr__()
+        return "(" + " + ".join(f"cycler({k!r}, {list(v)!r})" for k, v in self._columns.items()) + ")"
+
+    def __add__(self, other):
+        if isinstance(other, ColumnarCycler) and self._keys.isdisjoint(other._keys):
+            return ColumnarCycler({**self._columns, **other._columns})
+        return super().__add__(other)
+
+
+def cycler(*args, **kwargs):
+    """Same as `matplotlib.rcsetup.cycler`, but returns a `ColumnarCycler`."""
+    if args and kwargs:
+        raise TypeError("cycler() can only accept positional OR keyword "
+                        "arguments -- not both.")
+    elif not args and not kwargs:
+        raise TypeError("cycler() must have positional OR keyword arguments")
+
+    if len(args) == 1:
+        if not isinstance(args[0], Cycler):
+            raise TypeError("If only one positional argument given, it must "
+                            "be a Cycler instance.")
+        return validate_cycler(args[0])
+    elif len(args) == 2:
+        pairs = [(args[0], args[1])]
+    elif len(args) > 2:
+        raise TypeError(f"cycler() takes 0 to 2 positional arguments but {len(args)} were given")
+    else:
+        pairs = kwargs.items()
+
+    columns: dict[str, list[Any]] = {}
+    for prop, vals in pairs:
+        norm_prop = _prop_aliases.get(prop, prop)
+        validator = _prop_validators.get(norm_prop, None)
+        if validator is None:
+            raise TypeError("Unknown artist property: %s" % prop)
+        if norm_prop in columns:
+            raise ValueError("Can not compose overlapping cycles")
+        columns[norm_prop] = validator(vals)
+    return ColumnarCycler(columns)
+
+
+def _eval_cycler_expr(node: ast.expr) -> Any:
+    """Evaluates the subset of Python accepted by `matplotlib.rcsetup._parse_cycler_string`."""
+    if isinstance(node, ast.BinOp):
+        left = _eval_cycler_expr(node.left)
+        right = _eval_cycler_expr(node.right)
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+    if isinstance(node, ast.Call):
+        if not (isinstance(node.func, ast.Name) and node.func.id in ('cycler', 'concat')):
+            raise ValueError("only the 'cycler()' and 'concat()' functions are allowed")
+        func = cycler if node.func.id == 'cycler' else concat
+        args = [_eval_cycler_expr(a) for a in node.args]
+        kwargs = {kw.arg: _eval_cycler_expr(kw.value) for kw in node.keywords}
+        return func(*args, **kwargs)
+    if isinstance(node, ast.Subscript):
+        sl = node.slice
+        if not isinstance(sl, ast.Slice):
+            raise ValueError("only slicing is supported, not indexing")
+        s = slice(
+            ast.literal_eval(sl.lower) if sl.lower else None,
+            ast.literal_eval(sl.upper) if sl.upper else None,
+            ast.literal_eval(sl.step) if sl.step else None,
+        )
+        return _eval_cycler_expr(node.value)[s]
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError):
+        raise ValueError(f"Unsupported expression in cycler string: {ast.dump(node)}")
+
+
+def validate_cycler(s: Any) -> Cycler:
+    """Same as `matplotlib.rcsetup.validate_cycler`, but returns a `ColumnarCycler`.
+    Cyclers built only from `cycler(...) + cycler(...)` are not validated again."""
+    if isinstance(s, str):
+        try:
+            s = _eval_cycler_expr(ast.parse(s, mode='eval').body)
+        except Exception as e:
+            raise ValueError(f"{s!r} is not a valid cycler construction: {e}") from e
+    if isinstance(s, ColumnarCycler) and s.validated:
+        return s
+    if not isinstance(s, Cycler):
+        raise ValueError(f"Object is not a string or Cycler instance: {s!r}")
+
+    unknowns = s.keys - (set(_prop_validators) | set(_prop_aliases))
+    if unknowns:
+        raise ValueError("Unknown artist properties: %s" % unknowns)
+
+    columns: dict[str, list[Any]] = {}
+    for prop, vals in s.by_key().items():
+        norm_prop = _prop_aliases.get(prop, prop)
+        if norm_prop != prop and norm_prop in s.keys:
+            raise ValueError(f"Cannot specify both {norm_prop!r} and alias {prop!r} in the same prop_cycle")
+        if norm_prop in columns:
+            raise ValueError(f"Another property was already aliased to {norm_prop!r}. Collision normalizing {prop!r}.")
+        _prop_validators[norm_prop](vals)
+        columns[norm_prop] = vals
+    return ColumnarCycler(columns)
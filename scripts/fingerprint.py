@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import enum
+import hashlib
+from typing import Any, Mapping
+
+from canonical import canonical_value
+
+
+def stable_repr(value: Any) -> str:
+    """A repr of a canonical value that does not change between processes, unlike `hash()` of strings or `repr()` of arbitrary objects."""
+    if isinstance(value, tuple):
+        return "(" + ",".join(stable_repr(v) for v in value) + ")"
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__qualname__}.{value.name}"
+    if value is None or isinstance(value, (str, bool)):
+        return repr(value)
+    if isinstance(value, (int, float)):
+        # 2 and 2.0 are the same value
+        return repr(float(value))
+    if type(value).__repr__ is object.__repr__:
+        # e.g. the backend sentinel, whose default repr contains its address
+        return f"<{type(value).__qualname__}>"
+    return repr(value)
+
+
+def entry_digest(key: str, value: Any) -> int:
+    """The 128-bit digest of one validated entry."""
+    data = f"{key}\0{stable_repr(canonical_value(key, value))}".encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "big")
+
+
+class StyleFingerprint:
+    """A stable 128-bit fingerprint of a validated style.
+
+    The fingerprint is the XOR of the digests of the entries, so it does not depend on the order of the keys,
+    and changing a single key only needs the digests of its old and new values.
+    """
+
+    def __init__(self, params: Mapping[str, Any] = {}):
+        self.digests: dict[str, int] = {}
+        self.value = 0
+        for k, v in params.items():
+            self.set(k, v)
+
+    def set(self, key: str, value: Any):
+        self.remove(key)
+        digest = entry_digest(key, value)
+        self.digests[key] = digest
+        self.value ^= digest
+
+    def remove(self, key: str):
+        digest = self.digests.pop(key, None)
+        if digest is not None:
+            self.value ^= digest
+
+    def hexdigest(self):
+        return f"{self.value:032x}"
+
+
+def fingerprint(params: Mapping[str, Any]):
+    """Returns the fingerprint of a validated style as 32 hex digits."""
+    return StyleFingerprint(params).hexdigest()
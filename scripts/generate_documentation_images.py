@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import argparse
+import cProfile
+import csv
 import io
+import json
 import re
 import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 import matplotlib
 import matplotlib.pyplot as plt
@@ -13,6 +23,16 @@ import PIL.Image
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
+try:
+    # matplotlib >= v3.11
+    from matplotlib.style import _STYLE_BLACKLIST  # type: ignore
+except ImportError:
+    from matplotlib.style.core import STYLE_BLACKLIST as _STYLE_BLACKLIST  # type: ignore
+
+from fingerprint import fingerprint
+from image_diff import apply_changes, compare_dirs, format_summary
+from style_validation import validate_style
+
 out_dir = Path(__file__).parent.parent / "example"
 
 
@@ -65,31 +85,95 @@ def plot_axes_legend_col2(ax: Axes, title: str):
     ax.set_title(title)
 
 
-def render_figure(plot_axes: Callable[[Axes, str], None], key: str, value: str, defaults: list[tuple[str, str]]):
-    """https://matplotlib.org/stable/gallery/subplots_axes_and_figures/subplot.html"""
+PHASES = ("setup", "plot", "draw", "crop", "encode")
+
+
+@dataclass
+class RenderStats:
+    """Wall time spent in each phase of `render_figure`, in seconds."""
+    key: str
+    phases: dict[str, float] = field(default_factory=lambda: {p: 0.0 for p in PHASES})
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+
+def validate_pairs(pairs: list[tuple[str, str]]) -> list[tuple[str, object]]:
+    validated: list[tuple[str, object]] = []
+    for k, v in pairs:
+        if k not in matplotlib.rcParams.validate:
+            raise KeyError(f"{k} is not a valid rc parameter")
+        try:
+            validated.append((k, matplotlib.rcParams.validate[k](v)))
+        except ValueError as err:
+            raise ValueError(f"Key {k}: {err}") from None
+    return validated
+
+
+@contextmanager
+def rc_overlay(validated: list[tuple[str, object]]):
+    """A lightweight `matplotlib.rc_context` for values returned by `validate_pairs`. Only the overlaid keys are written and restored, without copying or revalidating the whole rcParams."""
+    rc = matplotlib.rcParams
+    set_raw = rc._set if hasattr(rc, "_set") else lambda k, v: dict.__setitem__(rc, k, v)  # type: ignore
+    orig = {k: dict.__getitem__(rc, k) for k, _ in validated}
+    try:
+        for k, v in validated:
+            set_raw(k, v)
+        yield
+    finally:
+        for k, v in orig.items():
+            set_raw(k, v)
+
+
+def render_image(plot_axes: Callable[[Axes, str], None], key: str, value: object, defaults: list[tuple[str, object]], stats: RenderStats | None = None):
+    """Renders the figure for already validated values (see `validate_pairs`). https://matplotlib.org/stable/gallery/subplots_axes_and_figures/subplot.html"""
+    if stats is None:
+        stats = RenderStats(key)
 
     def render_fig():
         fig: Figure
-        fig = plt.figure()
-        with matplotlib.rc_context({key: value}):
-            plot_axes(fig.add_subplot(121), matplotlib.rcParams[key])  # type: ignore
-        plot_axes(fig.add_subplot(122), matplotlib.rcParams[key])  # type: ignore
-
-        f = io.BytesIO()
-        plt.savefig(f, format="png")
-        plt.close()
-        return PIL.Image.open(f)
-
-    with matplotlib.rc_context({k: v for k, v in defaults}):
-        with matplotlib.rc_context({"figure.facecolor": "none"}):
+        with stats.phase("setup"):
+            fig = plt.figure()
+        with stats.phase("plot"):
+            with rc_overlay([(key, value)]):
+                plot_axes(fig.add_subplot(121), matplotlib.rcParams[key])  # type: ignore
+            plot_axes(fig.add_subplot(122), matplotlib.rcParams[key])  # type: ignore
+
+        # Equivalent to `plt.savefig(format="png")` followed by `PIL.Image.open`, without the intermediate PNG round trip
+        with stats.phase("draw"):
+            fig.canvas.draw()
+            im = PIL.Image.fromarray(np.array(fig.canvas.buffer_rgba()))  # type: ignore
+        plt.close(fig)
+        return im
+
+    with ExitStack() as stack:
+        with stats.phase("setup"):
+            stack.enter_context(rc_overlay(defaults))
+        with ExitStack() as transparent:
+            with stats.phase("setup"):
+                transparent.enter_context(rc_overlay(validate_pairs([("figure.facecolor", "none")])))
             bbox = render_fig().getbbox()
-        out_dir.mkdir(parents=True, exist_ok=True)
-        render_fig().crop(bbox).save(out_dir / f"{key}.png")
-
+        im = render_fig()
+    with stats.phase("crop"):
+        return im.crop(bbox)
 
-shutil.rmtree(out_dir, ignore_errors=True)
 
-plt.style.use(Path(__file__).parent / 'documentation-images.mplstyle')
+def render_figure(plot_axes: Callable[[Axes, str], None], key: str, value: object, defaults: list[tuple[str, object]], directory: Path = out_dir):
+    stats = RenderStats(key)
+    im = render_image(plot_axes, key, value, defaults, stats)
+    with stats.phase("encode"):
+        directory.mkdir(parents=True, exist_ok=True)
+        im.save(directory / f"{key}.png")
+    return stats
 
 todo = """
 axes.autolimit_mode: round_numbers
@@ -128,7 +212,8 @@ def parse_config(config: str):
         yield values
 
 
-for values in parse_config("""
+def documentation_entries() -> Iterator[tuple[Callable[[Axes, str], None], list[tuple[str, str]]]]:
+    for values in parse_config("""
 axes.edgecolor: green      WITH axes.linewidth: 1.5
 axes.facecolor: lightgreen
 axes.grid: True
@@ -202,21 +287,21 @@ xtick.minor.width: 5       WITH xtick.minor.visible: True; ytick.minor.visible:
 ytick.minor.width: 5       WITH xtick.minor.visible: True; ytick.minor.visible: True
 ytick.minor.left: False    WITH xtick.minor.visible: True; ytick.minor.visible: True
 """):
-    render_figure(plot_axes_simple, *values[0], values[1:])
+        yield plot_axes_simple, values
 
-for values in parse_config("""
+    for values in parse_config("""
 lines.solid_capstyle: round   WITH lines.linewidth: 15; axes.xmargin: 0.5; axes.ymargin: 0.3
 lines.solid_joinstyle: miter  WITH lines.linewidth: 15; axes.xmargin: 0.5; axes.ymargin: 0.3
 lines.dash_capstyle: round    WITH lines.linestyle: dashed; lines.linewidth: 5; lines.linewidth: 10
 lines.dash_joinstyle: miter   WITH lines.linestyle: dashed; lines.linewidth: 5; lines.linewidth: 10; axes.xmargin: 0.2; axes.ymargin: 0.3
 """):
-    render_figure(plot_capstyle_simple, *values[0], values[1:])
+        yield plot_capstyle_simple, values
 
-todo = """
+    todo = """
 legend.scatterpoints: 2
 """
 
-for values in parse_config("""
+    for values in parse_config("""
 legend.loc: center
 legend.frameon: False
 legend.framealpha: 0.2  WITH axes.facecolor: lightgreen; legend.edgecolor: black
@@ -235,11 +320,135 @@ legend.numpoints: 2
 legend.markerscale: 2.0
 legend.fancybox: False  WITH legend.edgecolor: green
 """):
-    render_figure(plot_axes_legend, *values[0], values[1:])
+        yield plot_axes_legend, values
 
-for values in parse_config("""
+    for values in parse_config("""
 legend.columnspacing: 4
 """):
-    render_figure(plot_axes_legend_col2, *values[0], values[1:])
-
-(out_dir / "index.txt").write_text("\n".join(f.name for f in out_dir.iterdir()))
+        yield plot_axes_legend_col2, values
+
+
+def write_report(path: Path, stats: list[RenderStats]):
+    rows = [{"key": s.key, "total": s.total, **s.phases} for s in sorted(stats, key=lambda s: s.total, reverse=True)]
+    if path.suffix == ".csv":
+        with path.open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["key", "total", *PHASES])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        path.write_text(json.dumps(rows, indent=2))
+
+
+def render_style_thumbnail(params: list[tuple[str, object]], out_file: Path):
+    """Draws the scenes of `plot_axes_simple` and `plot_axes_legend` with the validated rcParams of a whole style."""
+    with rc_overlay(params):
+        fig: Figure = plt.figure()
+        plot_axes_simple(fig.add_subplot(121), "title")
+        plot_axes_legend(fig.add_subplot(122), "title")
+        fig.canvas.draw()
+        im = PIL.Image.fromarray(np.array(fig.canvas.buffer_rgba()))  # type: ignore
+        plt.close(fig)
+
+    # Rename a complete file into place, so that an interrupted run does not leave a broken cache entry
+    tmp = out_file.with_suffix(".tmp")
+    im.save(tmp, format="png")
+    tmp.replace(out_file)
+    return out_file
+
+
+def render_gallery(styles: list[Path], gallery_dir: Path, max_workers: int | None = None):
+    """Renders a thumbnail of each style file on a process pool. Thumbnails are named after the fingerprint of the
+    validated style, so styles with the same content are rendered once and unchanged styles are skipped on later runs."""
+    # Every thumbnail has the same size regardless of the style. `figure.constrained_layout.use` still takes precedence over `figure.autolayout`.
+    size = validate_pairs([("figure.figsize", "6, 2"), ("figure.dpi", "100"), ("figure.autolayout", "True")])
+    gallery_dir.mkdir(parents=True, exist_ok=True)
+    index: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=plt.style.use, initargs=("default",)) as executor:
+        pending: dict[object, Path] = {}
+        # The styles of each scheduled thumbnail, to report failures and drop them from the index
+        scheduled: dict[Path, list[Path]] = {}
+        for style in styles:
+            result = validate_style(style.read_text(encoding="utf-8"))
+            for error in result.errors:
+                print(f"{style}:{error.line_no}: {error.message}", file=sys.stderr)
+            params = {k: v for k, v in result.params.items() if k not in _STYLE_BLACKLIST}
+            out_file = gallery_dir / f"{fingerprint(params)}.png"
+            index[style.name] = out_file.name
+            if out_file in scheduled:
+                scheduled[out_file].append(style)
+                continue
+            if out_file.exists():
+                continue
+            scheduled[out_file] = [style]
+            pending[executor.submit(render_style_thumbnail, [*params.items(), *size], out_file)] = out_file
+        print(f"rendering {len(pending)} of {len(styles)} styles", file=sys.stderr)
+        for future in as_completed(pending):  # type: ignore
+            out_file = pending[future]
+            try:
+                print(future.result().name, file=sys.stderr)
+            except Exception as err:
+                # e.g. `text.usetex: True` without LaTeX. The other thumbnails are still rendered.
+                for style in scheduled[out_file]:
+                    print(f"{style}: cannot render: {type(err).__name__}: {err}", file=sys.stderr)
+                    index.pop(style.name, None)
+    (gallery_dir / "index.json").write_text(json.dumps(index, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the images shown in hover.")
+    parser.add_argument("--report", type=Path, help="write the time spent in each phase per key, slowest first, to a .json or .csv file")
+    parser.add_argument("--profile", type=int, default=0, metavar="N", help="re-render the N slowest keys under cProfile")
+    parser.add_argument("--profile-dir", type=Path, default=Path("profile"), help="output directory for the .prof files (default: %(default)s)")
+    parser.add_argument("--changed-only", action="store_true", help="keep the existing images that did not change by more than --threshold and print the changed keys")
+    parser.add_argument("--threshold", type=float, default=0.0, help="minimum mean absolute pixel difference in [0, 1] for --changed-only (default: %(default)s)")
+    parser.add_argument("--gallery", type=Path, metavar="STYLE_DIR", help="instead of the hover images, render a thumbnail of each .mplstyle file in STYLE_DIR")
+    parser.add_argument("--gallery-dir", type=Path, default=Path("gallery"), help="output directory for --gallery (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, help="number of worker processes for --gallery (default: the number of CPUs)")
+    args = parser.parse_args()
+
+    if args.gallery is not None:
+        render_gallery(sorted(args.gallery.glob("**/*.mplstyle")), args.gallery_dir, args.jobs)
+        return
+
+    plt.style.use(Path(__file__).parent / 'documentation-images.mplstyle')
+
+    # Validate every entry before rendering anything
+    jobs: dict[str, tuple[Callable[[Axes, str], None], list[tuple[str, object]]]] = {}
+    errors: list[str] = []
+    for plot_axes, values in documentation_entries():
+        try:
+            jobs[values[0][0]] = (plot_axes, validate_pairs(values))
+        except (KeyError, ValueError) as err:
+            errors.append(f"{values[0][0]}: {err}")
+    if len(errors) > 0:
+        print("\n".join(errors), file=sys.stderr)
+        sys.exit(1)
+
+    if args.changed_only:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = [render_figure(plot_axes, *values[0], values[1:], directory=Path(tmp)) for plot_axes, values in jobs.values()]
+            changed = apply_changes(out_dir, Path(tmp), compare_dirs(out_dir, Path(tmp)), args.threshold)
+        print(f"{len(changed)} of {len(jobs)} images changed", file=sys.stderr)
+        if len(changed) > 0:
+            print(format_summary(changed))
+    else:
+        shutil.rmtree(out_dir, ignore_errors=True)
+        stats = [render_figure(plot_axes, *values[0], values[1:]) for plot_axes, values in jobs.values()]
+
+    if args.report is not None:
+        write_report(args.report, stats)
+
+    if args.profile > 0:
+        args.profile_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            for s in sorted(stats, key=lambda s: s.total, reverse=True)[:args.profile]:
+                plot_axes, values = jobs[s.key]
+                with cProfile.Profile() as profile:
+                    render_figure(plot_axes, *values[0], values[1:], directory=Path(tmp))
+                profile.dump_stats(args.profile_dir / f"{s.key}.prof")
+
+    (out_dir / "index.txt").write_text("\n".join(f.name for f in out_dir.iterdir() if f.name != "index.txt"))
+
+
+if __name__ == "__main__":
+    main()
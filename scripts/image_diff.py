@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import PIL.Image
+
+
+@dataclass
+class ImageDiff:
+    name: str
+    score: float
+    """Mean absolute difference of the RGBA channels over the pixels of the image, in [0, 1]. 1 if the image was added, removed or resized."""
+    hash_distance: int
+    """Hamming distance between the difference hashes of the two images, out of 64 bits."""
+
+
+def load_images(paths: list[Path]):
+    """Stacks the images into a zero-padded uint8 array of shape (N, H, W, 4) and also returns the (H, W) of each image."""
+    images = [np.asarray(PIL.Image.open(p).convert("RGBA")) for p in paths]
+    shapes = np.array([im.shape[:2] for im in images], dtype=np.int64).reshape(-1, 2)
+    height, width = shapes.max(axis=0) if len(images) > 0 else (0, 0)
+    stacked = np.zeros((len(images), height, width, 4), dtype=np.uint8)
+    for i, im in enumerate(images):
+        stacked[i, :im.shape[0], :im.shape[1]] = im
+    return stacked, shapes
+
+
+def dhash(paths: list[Path]) -> np.ndarray:
+    """Computes the 64-bit difference hash of each image. https://www.hackerfactor.com/blog/index.php?/archives/529-Kind-of-Like-That.html"""
+    small = np.stack([np.asarray(PIL.Image.open(p).convert("L").resize((9, 8), PIL.Image.Resampling.BILINEAR)) for p in paths]).reshape(-1, 8, 9)
+    return np.packbits(small[:, :, 1:] > small[:, :, :-1], axis=-1).reshape(-1, 8).view(">u8").ravel()
+
+
+def compare_dirs(old_dir: Path, new_dir: Path):
+    old_names = {p.name for p in old_dir.glob("*.png")} if old_dir.exists() else set()
+    new_names = {p.name for p in new_dir.glob("*.png")}
+    common = sorted(old_names & new_names)
+
+    old, old_shapes = load_images([old_dir / name for name in common])
+    new, new_shapes = load_images([new_dir / name for name in common])
+    if old.shape != new.shape:
+        # Pad both stacks to the same canvas so that they can be subtracted at once
+        height, width = max(old.shape[1], new.shape[1]), max(old.shape[2], new.shape[2])
+        old = np.pad(old, ((0, 0), (0, height - old.shape[1]), (0, width - old.shape[2]), (0, 0)))
+        new = np.pad(new, ((0, 0), (0, height - new.shape[1]), (0, width - new.shape[2]), (0, 0)))
+    # The padding is zero in both stacks, so the sum only covers the pixels of each image, which is divided by its own size
+    sums = np.abs(old.astype(np.int16) - new).sum(axis=(1, 2, 3), dtype=np.int64)
+    scores = sums / (np.maximum(old_shapes.prod(axis=1), 1) * 4 * 255)
+    scores[(old_shapes != new_shapes).any(axis=1)] = 1.0
+
+    distances = np.zeros(len(common), dtype=np.int64)
+    if len(common) > 0:
+        xor = dhash([old_dir / name for name in common]) ^ dhash([new_dir / name for name in common])
+        distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+    diffs = [ImageDiff(name, float(score), int(distance)) for name, score, distance in zip(common, scores, distances)]
+    diffs += [ImageDiff(name, 1.0, 64) for name in sorted(old_names ^ new_names)]
+    return diffs
+
+
+def apply_changes(old_dir: Path, new_dir: Path, diffs: list[ImageDiff], threshold: float):
+    """Copies the images that differ by more than `threshold` from `new_dir` to `old_dir` and removes the deleted ones. Returns the changed images."""
+    changed = [d for d in diffs if d.score > threshold]
+    old_dir.mkdir(parents=True, exist_ok=True)
+    for d in changed:
+        if (new_dir / d.name).exists():
+            shutil.copyfile(new_dir / d.name, old_dir / d.name)
+        else:
+            (old_dir / d.name).unlink()
+    return changed
+
+
+def format_summary(changed: list[ImageDiff]):
+    return "\n".join(f"{Path(d.name).stem}\tscore={d.score:.5f}\thash_distance={d.hash_distance}" for d in changed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lists the images in NEW that differ from the ones in OLD.")
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.0, help="minimum mean absolute difference in [0, 1] for an image to count as changed (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    changed = [d for d in compare_dirs(args.old, args.new) if d.score > args.threshold]
+    if args.json:
+        print(json.dumps([d.__dict__ for d in changed], indent=2))
+    elif len(changed) > 0:
+        print(format_summary(changed))
+    sys.exit(1 if len(changed) > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
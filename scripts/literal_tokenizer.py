@@ -0,0 +1,175 @@
+"""A shared parser for the nested numeric tuples and lists in rc values, e.g. `(0.1, 0.2, 0.3)` or `(0, (1, 2))`.
+
+`validate_color`, `_validate_legend_loc` and `_validate_linestyle` in `matplotlib.rcsetup` parse them with
+`ast.literal_eval`, and `validate_sketch` splits them itself. The validators below try this parser first and fall
+back to the original validator whenever the fast path does not produce a result, so the accepted syntax and the
+error messages stay exactly the same.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from numbers import Real
+from typing import Any, Callable
+
+import matplotlib.rcsetup as rcsetup
+from matplotlib.colors import is_color_like
+
+from style_validation import Validators, _validators
+
+_token = re.compile(r"\s*(?:(?P<num>[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)|(?P<punct>[()\[\],]))", re.ASCII)
+
+
+class _FrozenList(tuple):
+    """A list in a cached parse result, converted back into a fresh list by `_thaw`."""
+
+
+def _tokenize(s: str) -> list[str] | None:
+    tokens: list[str] = []
+    pos = 0
+    while pos < len(s):
+        m = _token.match(s, pos)
+        if m is None:
+            if s[pos:].strip(" \t\n\r\f") == "":
+                break
+            return None
+        num = m.group("num")
+        if num is not None and re.fullmatch(r"[-+]?0\d+", num):
+            # Python rejects leading zeros in integers
+            return None
+        tokens.append(num if num is not None else m.group("punct"))
+        pos = m.end()
+    return tokens
+
+
+@lru_cache(maxsize=4096)
+def _parse_frozen(s: str) -> Any:
+    tokens = _tokenize(s)
+    if not tokens:
+        return None
+    pos = 0
+
+    def value() -> Any:
+        nonlocal pos
+        tok = tokens[pos]
+        pos += 1
+        if tok in ("(", "["):
+            close = ")" if tok == "(" else "]"
+            items: list[Any] = []
+            trailing_comma = False
+            while tokens[pos] != close:
+                items.append(value())
+                trailing_comma = False
+                if tokens[pos] == ",":
+                    pos += 1
+                    trailing_comma = True
+                elif tokens[pos] != close:
+                    raise ValueError
+            pos += 1
+            if tok == "[":
+                return _FrozenList(items)
+            # `(x)` is x, but `(x,)` is a tuple
+            return items[0] if len(items) == 1 and not trailing_comma else tuple(items)
+        if tok in (")", "]", ","):
+            raise ValueError
+        return float(tok) if any(c in tok for c in ".eE") else int(tok)
+
+    try:
+        result = value()
+    except (ValueError, IndexError):
+        return None
+    return result if pos == len(tokens) else None
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, _FrozenList):
+        return [_thaw(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_thaw(v) for v in value)
+    return value
+
+
+def parse_numeric_literal(s: str) -> Any:
+    """Parses numbers and nested tuples and lists of numbers in the same way as `ast.literal_eval`.
+    Returns None for anything else, including valid Python literals this parser does not cover (e.g. `0x10` or `1_000`)."""
+    return _thaw(_parse_frozen(s))
+
+
+def validate_color(s: Any):
+    if isinstance(s, str) and s.lstrip()[:1] in ("(", "["):
+        color = parse_numeric_literal(s)
+        if color is not None and is_color_like(color):
+            return color
+    return rcsetup.validate_color(s)
+
+
+def _validate_legend_loc(loc: Any):
+    if isinstance(loc, str) and loc.lstrip()[:1] == "(":
+        parsed = parse_numeric_literal(loc)
+        if isinstance(parsed, tuple) and len(parsed) == 2 and all(isinstance(e, Real) for e in parsed):
+            return parsed
+    return rcsetup._validate_legend_loc(loc)
+
+
+def _validate_linestyle(ls: Any):
+    if isinstance(ls, str) and ls.lstrip()[:1] in ("(", "["):
+        parsed = parse_numeric_literal(ls)
+        if isinstance(parsed, (tuple, list)):
+            if len(parsed) == 2 and isinstance(parsed[1], (tuple, list)):
+                offset, onoff = parsed
+            else:
+                offset, onoff = 0, parsed
+            if isinstance(offset, Real) and len(onoff) % 2 == 0 and all(isinstance(e, Real) for e in onoff):
+                return (offset, onoff)
+    return rcsetup._validate_linestyle(ls)
+
+
+@lru_cache(maxsize=4096)
+def _parse_sketch(s: str) -> tuple[float, float, float] | None:
+    inner = s.lower().strip()
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    # Only a flat list of numbers takes the fast path, as `validate_sketch` splits on commas without parsing parentheses
+    if inner.strip() == "" or any(c in inner for c in "()[]"):
+        return None
+    parsed = _parse_frozen("(" + inner + ",)")
+    if isinstance(parsed, tuple) and len(parsed) == 3:
+        return (float(parsed[0]), float(parsed[1]), float(parsed[2]))
+    return None
+
+
+def validate_sketch(s: Any):
+    if isinstance(s, str):
+        parsed = _parse_sketch(s)
+        if parsed is not None:
+            return parsed
+    return rcsetup.validate_sketch(s)
+
+
+_replacements: dict[Callable[[Any], Any], Callable[[Any], Any]] = {
+    rcsetup.validate_color: validate_color,
+    rcsetup._validate_linestyle: _validate_linestyle,
+    rcsetup.validate_sketch: validate_sketch,
+}
+if hasattr(rcsetup, "_validate_legend_loc"):
+    _replacements[rcsetup._validate_legend_loc] = _validate_legend_loc
+
+
+def fast_validators(validators: Validators = _validators) -> dict[str, Callable[[Any], Any]]:
+    """Returns a copy of the validator table that uses the validators in this module where they apply."""
+    return {k: _replacements.get(v, v) for k, v in validators.items()}  # type: ignore
+
+
+if __name__ == "__main__":
+    # Compares the fast validators with the original ones
+    import timeit
+
+    for name, value in (("validate_color", "(0.1, 0.2, 0.3, 0.5)"), ("_validate_legend_loc", "(0.5, 0.5)"),
+                        ("_validate_linestyle", "(0, (3, 5, 1, 5))"), ("validate_sketch", "(1, 100, 2)")):
+        fast, original = globals()[name], getattr(rcsetup, name, None)
+        if original is None:
+            continue
+        assert fast(value) == original(value), name
+        t_original = timeit.timeit(lambda: original(value), number=20000) / 20000
+        t_fast = timeit.timeit(lambda: fast(value), number=20000) / 20000
+        print(f"{name}: {t_original * 1e6:.2f} us -> {t_fast * 1e6:.2f} us")
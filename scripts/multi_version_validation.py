@@ -0,0 +1,202 @@
+"""Validates styles against the rcsetup.py of several matplotlib releases at once.
+
+Each snapshot of rcsetup.py is executed as a separate module on top of the installed matplotlib. Validators that are
+structurally identical across snapshots (same bytecode, constants, defaults, closure contents and referenced globals) are
+replaced by a single shared object, so a style is validated once per distinct validator instead of once per version.
+"""
+from __future__ import annotations
+
+import argparse
+import builtins
+import importlib.util
+import re
+import sys
+import types
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+import matplotlib
+import matplotlib.rcsetup
+
+from canonical import canonical_value
+from fingerprint import stable_repr
+from style_validation import ValidationResult, Validators, parse_style, validate_entry
+
+vendored_rcsetup = Path(__file__).parent.parent / "matplotlib/lib/matplotlib/rcsetup.py"
+
+
+def load_rcsetup(path: Path, name: str) -> Validators:
+    """Executes a snapshot of rcsetup.py and returns its `_validators`."""
+    module_name = "_rcsetup_" + re.sub(r"\W", "_", name)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module._validators
+
+
+class _Structure:
+    """Computes a hashable key that is equal for validators that behave the same, even if they come from different snapshots."""
+
+    def __init__(self):
+        self.memo: dict[int, Hashable] = {}
+        self.keep_alive: list[Any] = []
+
+    def __call__(self, obj: Any) -> Hashable:
+        if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+            return (type(obj).__name__, obj)
+        key = self.memo.get(id(obj))
+        if key is not None:
+            return key
+        # Guards against recursion, e.g. a validator that refers to a table containing itself
+        self.memo[id(obj)] = ("recursive", getattr(obj, "__qualname__", type(obj).__qualname__))
+        self.keep_alive.append(obj)
+        key = self._compute(obj)
+        self.memo[id(obj)] = key
+        return key
+
+    def _compute(self, obj: Any) -> Hashable:
+        if isinstance(obj, types.ModuleType):
+            return ("module", obj.__name__ if not obj.__name__.startswith("_rcsetup_") else "rcsetup")
+        if isinstance(obj, (list, tuple)):
+            return (type(obj).__name__, tuple(self(v) for v in obj))
+        if isinstance(obj, (set, frozenset)):
+            return (type(obj).__name__, tuple(sorted(repr(self(v)) for v in obj)))
+        if isinstance(obj, dict):
+            return ("dict", tuple((self(k), self(v)) for k, v in obj.items()))
+        if isinstance(obj, types.CodeType):
+            return ("code", obj.co_code, obj.co_argcount, obj.co_kwonlyargcount, obj.co_flags, obj.co_names, obj.co_varnames, tuple(self(c) for c in obj.co_consts))
+        if isinstance(obj, re.Pattern):
+            return ("pattern", obj.pattern, obj.flags)
+        if type(obj) is object:
+            # e.g. `_auto_backend_sentinel = object()`, which is compared by identity within its snapshot
+            return ("sentinel",)
+        if isinstance(obj, partial):
+            return ("partial", self(obj.func), self(obj.args), self(obj.keywords))
+        if callable(obj) and hasattr(obj, "__wrapped__") and self._in_snapshot(obj):
+            # e.g. functions decorated with `functools.lru_cache`
+            return ("wrapped", type(obj).__qualname__, self(obj.__wrapped__))
+        if isinstance(obj, types.FunctionType):
+            if not self._in_snapshot(obj):
+                return ("object", id(obj))
+            return ("function", obj.__qualname__, self(obj.__code__), self(obj.__defaults__), self(obj.__kwdefaults__),
+                    tuple(self(c.cell_contents) for c in obj.__closure__ or ()), self._globals(obj.__code__, obj.__globals__))
+        if isinstance(obj, type):
+            if obj.__module__ == "matplotlib.rcsetup" or obj.__module__.startswith("_rcsetup_"):
+                return ("class", obj.__qualname__, self(tuple(obj.__bases__)), tuple((k, self(v)) for k, v in vars(obj).items() if not k.startswith("__") or k in ("__init__", "__call__")))
+            return ("object", id(obj))
+        if self._in_snapshot(type(obj)):
+            return ("instance", self(type(obj)), self(vars(obj)) if hasattr(obj, "__dict__") else None)
+        return ("object", id(obj))
+
+    def _in_snapshot(self, obj: Any):
+        module = getattr(obj, "__module__", None) or ""
+        return module == "matplotlib.rcsetup" or module.startswith("_rcsetup_")
+
+    def _globals(self, code: types.CodeType, globals_: dict[str, Any]) -> Hashable:
+        # `co_names` also contains attribute names, which are skipped when they are not globals
+        names: list[Hashable] = []
+        for name in code.co_names:
+            if name == "__name__":
+                # The module name differs between snapshots
+                names.append((name, "rcsetup"))
+            elif name in globals_:
+                names.append((name, self(globals_[name])))
+            elif not hasattr(builtins, name):
+                names.append((name, None))
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                names.append(self._globals(const, globals_))
+        return tuple(names)
+
+
+class MultiVersionValidators:
+    """Validator tables of several matplotlib versions, with the validators that behave the same shared between the tables."""
+
+    def __init__(self, tables: dict[str, Validators]):
+        structure = _Structure()
+        shared: dict[Hashable, Callable[[Any], Any]] = {}
+        self.tables: dict[str, dict[str, Callable[[Any], Any]]] = {}
+        for version, table in tables.items():
+            self.tables[version] = {k: shared.setdefault(structure(v), v) for k, v in table.items()}
+        self.distinct_validators = len({id(v) for t in self.tables.values() for v in t.values()})
+        self.total_validators = sum(len(t) for t in self.tables.values())
+
+    @property
+    def versions(self):
+        return list(self.tables)
+
+    def validate_style(self, text: str):
+        """Validates the style against every version. Each distinct validator runs once per entry."""
+        entries, parse_errors = parse_style(text)
+        results = {version: ValidationResult() for version in self.tables}
+        for entry in {e.key: e for e in entries}.values():
+            groups: dict[int, list[str]] = {}
+            for version, table in self.tables.items():
+                groups.setdefault(id(table.get(entry.key)), []).append(version)
+            for versions in groups.values():
+                value, error = validate_entry(entry, self.tables[versions[0]])
+                for version in versions:
+                    if error is None:
+                        results[version].params[entry.key] = value
+                    else:
+                        results[version].errors.append(error)
+        for result in results.values():
+            result.errors = sorted(parse_errors + result.errors, key=lambda e: e.line_no)
+        return results
+
+
+@dataclass(frozen=True)
+class Difference:
+    line_no: int
+    key: str
+    outcomes: dict[str, str]
+    """The validated value or the error message for each version"""
+
+
+def differences(text: str, results: dict[str, ValidationResult]):
+    """Lists the entries whose validated values or acceptance differ between the versions."""
+    entries, _ = parse_style(text)
+    diffs: list[Difference] = []
+    for entry in {e.key: e for e in entries}.values():
+        outcomes: dict[str, str] = {}
+        for version, result in results.items():
+            if entry.key in result.params:
+                outcomes[version] = stable_repr(canonical_value(entry.key, result.params[entry.key]))
+            else:
+                outcomes[version] = "error: " + next((e.message for e in result.errors if e.line_no == entry.line_no), "")
+        if len(set(outcomes.values())) > 1:
+            diffs.append(Difference(entry.line_no, entry.key, outcomes))
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validates styles against several versions of matplotlib.rcsetup and prints the differences.")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--rcsetup", action="append", default=[], metavar="NAME=PATH",
+                        help="a snapshot of rcsetup.py, can be repeated (default: the installed matplotlib and matplotlib/lib/matplotlib/rcsetup.py)")
+    args = parser.parse_args()
+
+    tables: dict[str, Validators] = {}
+    if not args.rcsetup:
+        tables[matplotlib.__version__] = matplotlib.rcsetup._validators  # type: ignore
+        args.rcsetup = [f"vendored={vendored_rcsetup}"]
+    for spec in args.rcsetup:
+        name, _, path = spec.partition("=")
+        tables[name] = load_rcsetup(Path(path), name)
+    validators = MultiVersionValidators(tables)
+    print(f"{validators.distinct_validators} distinct validators in {validators.total_validators} table entries of {len(tables)} versions", file=sys.stderr)
+
+    for path in args.files:
+        text = path.read_text(encoding="utf-8")
+        for d in differences(text, validators.validate_style(text)):
+            print(f"{path}:{d.line_no}: {d.key}")
+            for version, outcome in d.outcomes.items():
+                print(f"    {version}: {outcome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Sequence
+
+import matplotlib.colors
+import numpy as np
+from matplotlib.rcsetup import validate_color
+
+colors_json = Path(__file__).parent.parent / "matplotlib" / "colors.json"
+
+
+def srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Converts sRGB values in [0, 1] with shape (..., 3) to CIELAB (D65). https://en.wikipedia.org/wiki/CIELAB_color_space"""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ]) / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+class NearestColorIndex:
+    """Finds the nearest named color of many colors at once, by the Euclidean distance in CIELAB (CIE76)."""
+
+    def __init__(self, colors: dict[str, Sequence[float]], chunk_size: int = 4096):
+        # When several names have the same color, prefer CSS4 and tab: names over the single-letter and xkcd: ones
+        self.names = sorted(colors, key=lambda name: (name.startswith("xkcd:"), len(name) == 1, name))
+        self.lab = srgb_to_lab(np.array([colors[name][:3] for name in self.names], dtype=np.float64))
+        self.lab_sq = (self.lab ** 2).sum(axis=1)
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def load(path: Path = colors_json):
+        return NearestColorIndex(json.loads(path.read_text()))
+
+    def query_rgb(self, rgb: np.ndarray):
+        """Returns the indices into `self.names` and the distances of the nearest named colors of the (N, 3) sRGB array."""
+        lab = srgb_to_lab(np.asarray(rgb, dtype=np.float64).reshape(-1, 3))
+        indices = np.empty(len(lab), dtype=np.int64)
+        distances = np.empty(len(lab), dtype=np.float64)
+        # Process the queries in chunks to bound the size of the (chunk, names) distance matrix
+        for start in range(0, len(lab), self.chunk_size):
+            chunk = lab[start:start + self.chunk_size]
+            # |a - b|^2 = |a|^2 - 2 a.b + |b|^2, where |a|^2 does not affect the argmin
+            d2 = self.lab_sq[None, :] - 2 * chunk @ self.lab.T
+            i = d2.argmin(axis=1)
+            indices[start:start + len(chunk)] = i
+            distances[start:start + len(chunk)] = np.sqrt(np.maximum(d2[np.arange(len(chunk)), i] + (chunk ** 2).sum(axis=1), 0))
+        return indices, distances
+
+    def nearest(self, colors: Sequence[str | Sequence[float]]):
+        """Maps colors in any format accepted by `matplotlib.colors.to_rgba_array`, e.g. `#1f77b5`, to the names of the nearest named colors."""
+        indices, _ = self.query_rgb(matplotlib.colors.to_rgba_array(colors)[:, :3])
+        return [self.names[i] for i in indices]
+
+
+if __name__ == "__main__":
+    # Reads one color per line from stdin and prints the nearest named color of each
+    queries = [line.strip() for line in sys.stdin if line.strip() != ""]
+    for query, name in zip(queries, NearestColorIndex.load().nearest([validate_color(q) for q in queries])):
+        print(f"{query}\t{name}")
@@ -0,0 +1,97 @@
+"""Renders hover images for arbitrary `key: value` pairs on request.
+
+Reads one JSON object per line from stdin, e.g. `{"id": 1, "key": "lines.linewidth", "value": "4.5"}`,
+and writes one JSON object per line to stdout, either `{"id": 1, "png": "<base64>"}` or `{"id": 1, "error": "<message>"}`.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import json
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+
+from generate_documentation_images import (documentation_entries, plot_axes_legend, plot_axes_legend_col2, plot_axes_simple,
+                                           plot_capstyle_simple, render_image, validate_pairs)
+
+# The scene and the additional rcParams used for each key in the documentation images, e.g. `lines.markersize` needs `lines.marker: o`
+documented = {values[0][0]: (plot_axes, values[1:]) for plot_axes, values in documentation_entries()}
+
+
+def scene(key: str) -> tuple[Callable[[Axes, str], None], list[tuple[str, str]]]:
+    if key in documented:
+        return documented[key]
+    if key == "legend.columnspacing":
+        return plot_axes_legend_col2, []
+    if key.startswith("legend."):
+        return plot_axes_legend, []
+    if key.endswith(("capstyle", "joinstyle")):
+        return plot_capstyle_simple, []
+    return plot_axes_simple, []
+
+
+class PreviewCache:
+    """An LRU cache of PNG images keyed by the key and the validated value, so that e.g. `True` and `yes` share an entry."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        # pyplot is not thread-safe either, so the lock is held while rendering
+        self.lock = threading.Lock()
+
+    def render(self, key: str, value: str):
+        with self.lock:
+            return self._render(key, value)
+
+    def _render(self, key: str, value: str):
+        validated = validate_pairs([(key, value)])[0][1]
+        cache_key = (key, repr(validated))
+        if cache_key in self.entries:
+            self.entries.move_to_end(cache_key)
+            return self.entries[cache_key]
+
+        plot_axes, defaults = scene(key)
+        f = io.BytesIO()
+        render_image(plot_axes, key, validated, validate_pairs(defaults)).save(f, format="png")
+        png = f.getvalue()
+
+        self.entries[cache_key] = png
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return png
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache-size", type=int, default=256, help="maximum number of cached images (default: %(default)s)")
+    args = parser.parse_args()
+
+    plt.style.use(Path(__file__).parent / 'documentation-images.mplstyle')
+    cache = PreviewCache(args.cache_size)
+
+    for line in sys.stdin:
+        if line.strip() == "":
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            png = cache.render(request["key"], str(request["value"]))
+            response = {"id": request_id, "png": base64.b64encode(png).decode()}
+        except Exception as err:
+            response = {"id": request_id, "error": f"{type(err).__name__}: {err}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    matplotlib.use("agg")
+    main()
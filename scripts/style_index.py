@@ -0,0 +1,279 @@
+"""A columnar index of the validated rc values of a corpus of styles.
+
+Each key is stored as one typed NumPy column with a row per style, so that questions like "which styles set
+`axes.facecolor` to a dark color" are vectorized expressions:
+
+    index = StyleIndex.load(Path("index"))
+    color = index.column("axes.facecolor")
+    index.files_where(color.present & (color.values[:, :3] @ [0.2126, 0.7152, 0.0722] < 0.2))
+
+The index is saved as a directory of `.npy` files and an `index.json`, and `StyleIndex.load` memory-maps the arrays.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Literal
+
+import matplotlib.colors
+import numpy as np
+from matplotlib.rcsetup import ValidateInStrings  # type: ignore
+
+from canonical import canonical_value, is_color_validator
+from concurrent_validation import validate_concurrently
+from fingerprint import stable_repr
+from style_validation import Validators, _validators
+
+FORMAT_VERSION = 1
+
+Kind = Literal["bool", "int", "float", "color", "enum", "category"]
+
+
+@dataclass
+class Column:
+    kind: Kind
+    present: np.ndarray
+    """Whether each style sets the key"""
+    values: np.ndarray
+    """bool, int64 or float64 for bool, int and float columns, float64 RGBA rows for color columns, and int32 codes into
+    `categories` for enum and category columns. Rows of styles that do not set the key hold False, 0, NaN or -1.
+    None in a float column is NaN in a present row."""
+    categories: list[str] | None = None
+    """The names of the codes. Enums use the choices of the `ValidateInStrings` validator, and the other categories use
+    `stable_repr` of the canonical value."""
+    codes: np.ndarray | None = None
+    """For color columns, the int32 codes into `categories` of the values that are not a fixed color (e.g. `C0`, `auto`
+    or None), whose RGBA rows are NaN. -1 elsewhere."""
+
+    def code(self, value: Any, key: str) -> int:
+        """The code of a value in `categories`, or -1 if no style has that value."""
+        assert self.categories is not None
+        label = value if self.kind == "enum" else stable_repr(canonical_value(key, value))
+        try:
+            return self.categories.index(label)
+        except ValueError:
+            return -1
+
+
+# The validators whose values are always of one numeric type. `*_or_None` validators are float columns, with None as NaN.
+_numeric_kinds: dict[str, Kind] = {
+    "validate_bool": "bool",
+    "validate_int": "int",
+    "validate_float": "float",
+    "validate_float_or_None": "float",
+    "validate_int_or_None": "float",
+    "_validate_greaterthan_minushalf": "float",
+    "_validate_greaterequal0_lessequal1": "float",
+}
+
+
+def column_kind(validator: Any) -> Kind:
+    """The kind of the column of a key, which depends only on its validator so that every index has the same schema.
+    `build_column` only deviates from it for ints that do not fit in int64, which are stored as a category column."""
+    if isinstance(validator, ValidateInStrings):
+        return "enum"
+    kind = _numeric_kinds.get(getattr(validator, "__name__", ""))
+    if kind is not None:
+        return kind
+    if is_color_validator(validator):
+        return "color"
+    return "category"
+
+
+def _is_fixed_color(value: Any):
+    # `C0`, `C1`, ... depend on the prop cycle
+    return not (isinstance(value, str) and re.fullmatch(r"C\d+", value)) and matplotlib.colors.is_color_like(value)
+
+
+def _encode(labels: list[str], categories: list[str]):
+    codes = {c: i for i, c in enumerate(categories)}
+    return np.array([codes[label] for label in labels], dtype=np.int32)
+
+
+_int64_min, _int64_max = int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max)
+
+
+def build_column(key: str, rows: list[int], values: list[Any], n: int, validator: Any) -> Column:
+    """Builds the column of `key` from the values of the styles at the indices `rows` out of `n` styles."""
+    kind = column_kind(validator)
+    if kind == "int" and not all(_int64_min <= v <= _int64_max for v in values):
+        # e.g. `legend.numpoints: 99999999999999999999999`, which `validate_int` accepts
+        kind = "category"
+    present = np.zeros(n, dtype=bool)
+    present[rows] = True
+    if kind == "bool":
+        array = np.zeros(n, dtype=bool)
+        array[rows] = values
+        return Column(kind, present, array)
+    if kind == "int":
+        array = np.zeros(n, dtype=np.int64)
+        array[rows] = values
+        return Column(kind, present, array)
+    if kind == "float":
+        array = np.full(n, np.nan)
+        array[rows] = [np.nan if v is None else v for v in values]
+        return Column(kind, present, array)
+    if kind == "color":
+        fixed = np.array([_is_fixed_color(v) for v in values], dtype=bool)
+        fixed_rows = np.asarray(rows)[fixed]
+        other_rows = np.asarray(rows)[~fixed]
+        array = np.full((n, 4), np.nan)
+        array[fixed_rows] = matplotlib.colors.to_rgba_array([v for v, f in zip(values, fixed) if f]).reshape(-1, 4)
+        labels = [stable_repr(canonical_value(key, v)) for v, f in zip(values, fixed) if not f]
+        categories = sorted(set(labels))
+        codes = np.full(n, -1, dtype=np.int32)
+        codes[other_rows] = _encode(labels, categories)
+        return Column(kind, present, array, categories, codes)
+
+    if kind == "enum":
+        categories = sorted(set(validator.valid.values()))
+        labels = [str(v) for v in values]
+        categories += sorted(set(labels) - set(categories))
+    else:
+        labels = [stable_repr(canonical_value(key, v)) for v in values]
+        categories = sorted(set(labels))
+    array = np.full(n, -1, dtype=np.int32)
+    array[rows] = _encode(labels, categories)
+    return Column(kind, present, array, categories)
+
+
+class StyleIndex:
+    def __init__(self, files: list[str], columns: dict[str, Column], error_counts: np.ndarray):
+        self.files = files
+        self.columns = columns
+        self.error_counts = error_counts
+        """The number of invalid lines of each style, or 1 for a file that could not be read"""
+
+    @classmethod
+    def build(cls, files: Iterable[Path], validators: Validators = _validators, max_workers: int | None = None):
+        """Validates the style files with `validators` and builds the index. Files that cannot be read are indexed as
+        empty styles with one error, and reported on stderr."""
+        files = list(files)
+        rows: dict[str, list[int]] = {}
+        values: dict[str, list[Any]] = {}
+        error_counts = np.zeros(len(files), dtype=np.int32)
+        unreadable: set[int] = set()
+
+        def read(i: int, f: Path):
+            try:
+                return f.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as err:
+                print(f"{f}: {err}", file=sys.stderr)
+                unreadable.add(i)
+                return ""
+
+        texts = (read(i, f) for i, f in enumerate(files))
+        for i, result in enumerate(validate_concurrently(texts, max_workers, validators=validators)):
+            error_counts[i] = len(result.errors) + (i in unreadable)
+            for k, v in result.params.items():
+                rows.setdefault(k, []).append(i)
+                values.setdefault(k, []).append(v)
+        columns = {k: build_column(k, rows[k], values[k], len(files), validators[k]) for k in sorted(rows)}
+        return cls([str(f) for f in files], columns, error_counts)
+
+    def column(self, key: str):
+        """Raises KeyError if no style sets `key`."""
+        return self.columns[key]
+
+    def files_where(self, mask: np.ndarray):
+        return [self.files[i] for i in np.flatnonzero(mask)]
+
+    def save(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        meta: dict[str, Any] = {"version": FORMAT_VERSION, "files": self.files, "columns": {}}
+        np.save(directory / "error_counts.npy", self.error_counts)
+        for k, c in self.columns.items():
+            np.save(directory / f"{k}.present.npy", c.present)
+            np.save(directory / f"{k}.values.npy", c.values)
+            if c.codes is not None:
+                np.save(directory / f"{k}.codes.npy", c.codes)
+            meta["columns"][k] = {"kind": c.kind, **({"categories": c.categories} if c.categories is not None else {})}
+        (directory / "index.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: Literal["r", "c"] | None = "r"):
+        """Loads an index saved by `save`. The arrays are memory-mapped read-only by default."""
+        meta = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index version {meta['version']}")
+        columns = {
+            k: Column(
+                c["kind"],
+                np.load(directory / f"{k}.present.npy", mmap_mode=mmap_mode),
+                np.load(directory / f"{k}.values.npy", mmap_mode=mmap_mode),
+                c.get("categories"),
+                np.load(directory / f"{k}.codes.npy", mmap_mode=mmap_mode) if c["kind"] == "color" else None,
+            )
+            for k, c in meta["columns"].items()
+        }
+        return cls(meta["files"], columns, np.load(directory / "error_counts.npy", mmap_mode=mmap_mode))
+
+
+def _shorten(label: str, width: int = 80):
+    return label if len(label) <= width else label[:width - 3] + "..."
+
+
+def describe(index: StyleIndex, key: str):
+    """A short summary of the distribution of the values of `key`."""
+    c = index.column(key)
+    n = int(c.present.sum())
+    lines = [f"{key} ({c.kind}): set in {n} of {len(index.files)} styles"]
+    if n == 0:
+        return "\n".join(lines)
+    if c.kind == "bool":
+        true = int(c.values[c.present].sum())
+        lines.append(f"  True: {true}, False: {n - true}")
+    elif c.kind in ("int", "float"):
+        values = np.asarray(c.values[c.present], dtype=float)
+        finite = values[~np.isnan(values)]
+        if len(finite) != len(values):
+            lines.append(f"  None: {len(values) - len(finite)}")
+        if len(finite):
+            q = np.percentile(finite, [0, 25, 50, 75, 100])
+            lines.append("  min {:g}, 25% {:g}, median {:g}, 75% {:g}, max {:g}".format(*q))
+    elif c.kind == "color":
+        assert c.categories is not None and c.codes is not None
+        fixed = c.present & (c.codes == -1)
+        counts = Counter(matplotlib.colors.to_hex(rgba, keep_alpha=True) for rgba in c.values[fixed])
+        counts.update({_shorten(c.categories[i]): int(count) for i, count in enumerate(np.bincount(c.codes[c.codes >= 0], minlength=len(c.categories)))})
+        lines += [f"  {color}: {count}" for color, count in counts.most_common(10) if count]
+    else:
+        assert c.categories is not None
+        counts = np.bincount(c.values[c.present], minlength=len(c.categories))
+        lines += [f"  {_shorten(c.categories[i])}: {counts[i]}" for i in np.argsort(-counts, kind="stable")[:10] if counts[i]]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds or queries a columnar index of the rc values of a corpus of styles.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="index .mplstyle files and the .mplstyle files under directories")
+    build.add_argument("paths", type=Path, nargs="+")
+    build.add_argument("--out", type=Path, required=True, help="the index directory")
+    build.add_argument("--jobs", type=int, help="the number of validation threads (default: the number of CPUs)")
+    show = subparsers.add_parser("describe", help="print the distribution of the values of keys")
+    show.add_argument("index", type=Path)
+    show.add_argument("keys", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        files = [f for p in args.paths for f in (sorted(p.glob("**/*.mplstyle")) if p.is_dir() else [p])]
+        index = StyleIndex.build(files, max_workers=args.jobs)
+        index.save(args.out)
+        print(f"Indexed {len(files)} styles, {len(index.columns)} keys")
+    else:
+        index = StyleIndex.load(args.index)
+        for key in args.keys:
+            try:
+                print(describe(index, key))
+            except KeyError:
+                print(f"{key}: not set in any style")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Hashable, Mapping
+
+import matplotlib
+from matplotlib.rcsetup import _hardcoded_defaults  # type: ignore
+
+from canonical import canonical_value
+from style_validation import parse_style, validate_entry, validate_style
+
+default_matplotlibrc = Path(matplotlib.get_data_path()) / "matplotlibrc"
+
+
+def load_defaults(matplotlibrc: Path = default_matplotlibrc) -> dict[str, Any]:
+    """Reads the default rcParams in the same way as `matplotlib.rcParamsDefault`, where every entry in the sample matplotlibrc is commented out."""
+    text = "\n".join(line[1:] if line.startswith("#") else line for line in matplotlibrc.read_text(encoding="utf-8").splitlines())
+    return {**validate_style(text).params, **_hardcoded_defaults}
+
+
+def _hash(value: Hashable):
+    try:
+        return hash(value)
+    except TypeError:
+        return None
+
+
+class StyleMinimizer:
+    """Removes the entries of styles that are equal to the defaults after canonicalization (see `canonical.canonical_value`)."""
+
+    def __init__(self, defaults: Mapping[str, Any]):
+        self.defaults = {k: canonical_value(k, v) for k, v in defaults.items()}
+        self.hashes = {k: _hash(v) for k, v in self.defaults.items()}
+
+    def is_default(self, key: str, value: Any):
+        """`value` is a validated value."""
+        if key not in self.defaults:
+            return False
+        c = canonical_value(key, value)
+        h = _hash(c)
+        if h is not None and self.hashes[key] is not None and h != self.hashes[key]:
+            return False
+        return c == self.defaults[key]
+
+    def minimize(self, params: Mapping[str, Any]):
+        return {k: v for k, v in params.items() if not self.is_default(k, v)}
+
+    def minimize_text(self, text: str):
+        """Returns the lines of a style whose entries differ from the defaults. Invalid entries are kept as is.
+
+        The lines are copied from `text`, as `Entry.value` has lost the double quotes that protect e.g. `"#fafafa"`.
+        """
+        entries, _ = parse_style(text)
+        source = text.splitlines()
+        lines: list[str] = []
+        for entry in {e.key: e for e in entries}.values():
+            value, error = validate_entry(entry)
+            if error is not None or not self.is_default(entry.key, value):
+                lines.append(source[entry.line_no - 1].strip())
+        return "".join(line + "\n" for line in lines)
+
+    def check(self, text: str, minimized: str):
+        """Returns the keys whose validated values in `minimized` differ from those of `text` without the defaults."""
+        expected = self.minimize(validate_style(text).params)
+        actual = validate_style(minimized).params
+        return sorted(k for k in expected.keys() | actual.keys()
+                      if k not in expected or k not in actual or canonical_value(k, expected[k]) != canonical_value(k, actual[k]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Removes the entries of .mplstyle files that are equal to the matplotlib defaults.")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--matplotlibrc", type=Path, default=default_matplotlibrc, help="the sample matplotlibrc that defines the defaults (default: %(default)s)")
+    parser.add_argument("--in-place", action="store_true", help="overwrite the files instead of printing the results")
+    args = parser.parse_args()
+
+    minimizer = StyleMinimizer(load_defaults(args.matplotlibrc))
+    for path in args.files:
+        text = path.read_text(encoding="utf-8")
+        minimized = minimizer.minimize_text(text)
+        mismatches = minimizer.check(text, minimized)
+        if mismatches:
+            print(f"{path}: skipped, the minimized style does not validate to the same values for {', '.join(mismatches)}", file=sys.stderr)
+            continue
+        if args.in_place:
+            path.write_text(minimized, encoding="utf-8")
+        else:
+            print(f"# {path}")
+            print(minimized, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+from matplotlib.cbook import _strip_comment  # type: ignore
+from matplotlib.rcsetup import _validators  # type: ignore
+
+Validators = Mapping[str, Callable[[Any], Any]]
+
+
+@dataclass(frozen=True)
+class Entry:
+    line_no: int
+    key: str
+    value: str
+
+
+@dataclass(frozen=True)
+class StyleError:
+    line_no: int
+    key: str | None
+    message: str
+
+
+@dataclass
+class ValidationResult:
+    params: dict[str, Any] = field(default_factory=dict)
+    errors: list[StyleError] = field(default_factory=list)
+
+
+def parse_style(text: str):
+    """Splits a .mplstyle or matplotlibrc file into entries in the same way as `matplotlib._rc_params_in_file`."""
+    entries: list[Entry] = []
+    errors: list[StyleError] = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        try:
+            stripped = _strip_comment(line)
+        except ValueError as err:
+            errors.append(StyleError(line_no, None, str(err)))
+            continue
+        if not stripped:
+            continue
+        tup = stripped.split(':', 1)
+        if len(tup) != 2:
+            errors.append(StyleError(line_no, None, "Missing colon"))
+            continue
+        key, value = tup[0].strip(), tup[1].strip()
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]  # strip double quotes
+        entries.append(Entry(line_no, key, value))
+    return entries, errors
+
+
+def validate_entry(entry: Entry, validators: Validators = _validators) -> tuple[Any, StyleError | None]:
+    if entry.key not in validators:
+        return None, StyleError(entry.line_no, entry.key, f"Bad key {entry.key}")
+    try:
+        return validators[entry.key](entry.value), None
+    except Exception as err:
+        return None, StyleError(entry.line_no, entry.key, str(err))
+
+
+def validate_entries(entries: Iterable[Entry], validators: Validators = _validators):
+    """Validates the entries with the validators of `matplotlib.rcsetup`. As in matplotlib, only the last entry of each key is used."""
+    result = ValidationResult()
+    for entry in {e.key: e for e in entries}.values():
+        value, error = validate_entry(entry, validators)
+        if error is None:
+            result.params[entry.key] = value
+        else:
+            result.errors.append(error)
+    return result
+
+
+def validate_style(text: str, validators: Validators = _validators):
+    entries, errors = parse_style(text)
+    result = validate_entries(entries, validators)
+    result.errors = sorted(errors + result.errors, key=lambda e: e.line_no)
+    return result
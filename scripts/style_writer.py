@@ -0,0 +1,160 @@
+"""Writes validated rc values back as matplotlibrc text that the validators read back to the same values.
+
+    writer = StyleWriter(sys.stdout)
+    for name, params in styles:
+        writer.write_style(params, name)
+"""
+from __future__ import annotations
+
+import argparse
+import enum
+import sys
+from numbers import Integral, Real
+from pathlib import Path
+from typing import Any, Iterator, Mapping, TextIO
+
+import matplotlib.colors
+import numpy as np
+from cycler import Cycler
+from matplotlib.cbook import _strip_comment  # type: ignore
+
+from canonical import is_color_validator
+from style_validation import _validators, validate_style
+
+
+def _number(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "True" if value else "False"
+    if isinstance(value, Integral):
+        return str(int(value))
+    # repr() of np.float64 is `np.float64(1.5)` in NumPy >= 2
+    return repr(float(value))
+
+
+def _literal(value: Any) -> str:
+    """A Python literal of nested tuples and lists of numbers and strings, for `ast.literal_eval` and `validate_cycler`."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, enum.Enum):
+        # before str, as JoinStyle and CapStyle are str subclasses
+        return repr(value.value)
+    if value is None or isinstance(value, str):
+        return repr(value)
+    if isinstance(value, (Real, np.bool_)):
+        return _number(value)
+    if isinstance(value, tuple):
+        items = [_literal(v) for v in value]
+        return "(" + items[0] + ",)" if len(items) == 1 else "(" + ", ".join(items) + ")"
+    if isinstance(value, list):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    raise ValueError(f"Cannot write {value!r} as a literal")
+
+
+def _list_item(value: Any, color: bool) -> str:
+    if color and isinstance(value, (tuple, list, np.ndarray)):
+        # Comma-separated color lists cannot contain tuples
+        return matplotlib.colors.to_hex(value, keep_alpha=True)
+    text = _scalar(value)
+    if "," in text or text != text.strip():
+        raise ValueError(f"Cannot write {value!r} as an item of a comma-separated list")
+    return text
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return "None"
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (Real, np.bool_)):
+        return _number(value)
+    if isinstance(value, (tuple, np.ndarray)):
+        return _literal(value)
+    raise ValueError(f"Cannot write {value!r}")
+
+
+# Keys whose validators do not read `None` as None
+_none_spellings = {"savefig.bbox": "standard"}
+
+
+def format_value(key: str, value: Any) -> str:
+    """Formats a validated value as the right-hand side of a `key: value` line, quoted if necessary."""
+    if value is None and key in _none_spellings:
+        text = _none_spellings[key]
+    elif isinstance(value, Cycler):
+        text = "cycler(" + ", ".join(f"{k}={_literal(list(v))}" for k, v in value.by_key().items()) + ")"
+    elif isinstance(value, list):
+        color = is_color_validator(_validators.get(key))
+        text = ", ".join(_list_item(v, color) for v in value)
+    else:
+        text = _scalar(value)
+
+    if "\n" in text or "\r" in text:
+        raise ValueError(f"{key}: values cannot contain line breaks")
+    # `#` starts a comment and surrounding whitespace and double quotes are stripped, unless the value is double-quoted
+    if "#" in text or text != text.strip() or (len(text) >= 2 and text.startswith('"') and text.endswith('"')):
+        text = f'"{text}"'
+    try:
+        ok = _strip_comment(text) == text
+    except ValueError:
+        ok = False
+    if not ok:
+        raise ValueError(f"{key}: {text!r} cannot be written without its double quotes being misread")
+    return text
+
+
+class StyleWriter:
+    """Writes styles to a text stream. Equal values of the same key are formatted once."""
+
+    def __init__(self, stream: TextIO, sort_keys: bool = True):
+        self.stream = stream
+        self.sort_keys = sort_keys
+        self.cache: dict[tuple[str, type, Any], str] = {}
+        self.styles = 0
+
+    def format_value(self, key: str, value: Any):
+        try:
+            # The type is part of the key, as 1 == 1.0 == True
+            cache_key = (key, type(value), value)
+            text = self.cache.get(cache_key)
+        except TypeError:  # unhashable, e.g. lists and cyclers
+            return format_value(key, value)
+        if text is None:
+            text = self.cache[cache_key] = format_value(key, value)
+        return text
+
+    def lines(self, params: Mapping[str, Any]) -> Iterator[str]:
+        for key in sorted(params) if self.sort_keys else params:
+            yield f"{key}: {self.format_value(key, params[key])}\n"
+
+    def write_style(self, params: Mapping[str, Any], name: str | None = None):
+        """Writes a style, preceded by a blank line if it is not the first one and by `# name` if a name is given."""
+        if self.styles > 0:
+            self.stream.write("\n")
+        if name is not None:
+            self.stream.write(f"# {name}\n")
+        self.stream.writelines(self.lines(params))
+        self.styles += 1
+
+
+def format_style(params: Mapping[str, Any], sort_keys: bool = True):
+    return "".join(f"{k}: {format_value(k, params[k])}\n" for k in (sorted(params) if sort_keys else params))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validates style files and writes them back in canonical form to a single stream.")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--out", type=argparse.FileType("w", encoding="utf-8"), default=sys.stdout, help="(default: stdout)")
+    args = parser.parse_args()
+
+    writer = StyleWriter(args.out)
+    for path in args.files:
+        result = validate_style(path.read_text(encoding="utf-8"))
+        for error in result.errors:
+            print(f"{path}:{error.line_no}: {error.message}", file=sys.stderr)
+        writer.write_style(result.params, str(path))
+
+
+if __name__ == "__main__":
+    main()
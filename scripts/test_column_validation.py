@@ -0,0 +1,46 @@
+import matplotlib.rcsetup as rcsetup
+import numpy as np
+import pytest
+
+from column_validation import validate_column
+
+
+def validate_one_by_one(key, values):
+    results, failed = [], []
+    for v in values:
+        try:
+            results.append(rcsetup._validators[key](v))
+            failed.append(False)
+        except Exception:
+            results.append(None)
+            failed.append(True)
+    return results, failed
+
+
+dates = ['2000-01-01', '1970-01-01T00:00:00', '1970-01-01T00:00:00.123456789', '300000-01-01', '-1000-01-01',
+         'now', 'today', 'NaT', '', '2000-13-01', '2000-02-30', 'bad', ' 2000-01-01', '2000']
+
+
+def test_date():
+    # Enough values that the vectorized cast runs on chunks before falling back to single values
+    values = dates * 20
+    result = validate_column('date.epoch', values)
+    expected, failed = validate_one_by_one('date.epoch', values)
+    assert result.failed.tolist() == failed
+    assert result.values.tolist() == expected
+
+
+@pytest.mark.parametrize("key, values", [
+    ('lines.linewidth', ['1', '1.5', ' 2 ', '1e3', 'inf', 'nan', '1_0', '0x10', '١', '', 'bad']),
+    ('legend.numpoints', ['1', '-2', ' 3', '1_0', '1.5', '99999999999999999999999', '١', '']),
+    ('axes.grid', ['True', 'false', 'YES', 'off', '1', '0', 'maybe', '']),
+    ('savefig.dpi', ['figure', '100', '72.5', 'Figure', '']),
+    ('path.simplify_threshold', ['0', '1', '0.5', '-0.1', '1.1', 'nan', '']),
+])
+def test_scalar(key, values):
+    result = validate_column(key, values * 20)
+    expected, failed = validate_one_by_one(key, values * 20)
+    assert result.failed.tolist() == failed
+    for value, e, f in zip(result.values.tolist(), expected, failed):
+        if not f and e != 'figure':
+            assert value == e or (isinstance(e, float) and np.isnan(e) and np.isnan(value))
@@ -0,0 +1,24 @@
+from export_matplotlibrc_index import export_index
+
+content = """\
+## ***************************************************************************
+## * LINES                                                                   *
+## ***************************************************************************
+## See https://matplotlib.org/stable/api/artist_api.html#module-matplotlib.lines
+## for more information on line properties.
+#lines.linewidth: 1.5     # line width in points
+#lines.linestyle: -       # solid line
+
+## The dash pattern of each line style
+#lines.dashed_pattern: 3.7, 1.6
+#lines.dotted_pattern: 1, 1.65
+"""
+
+
+def test_export_index():
+    index = export_index(content)
+    assert index["sections"] == [{"title": "LINES", "body": "See https://matplotlib.org/stable/api/artist_api.html#module-matplotlib.lines\nfor more information on line properties.\n"}]
+    assert index["params"]["lines.linewidth"] == {"exampleValue": "1.5", "default": 1.5, "comment": "line width in points", "section": 0}
+    assert index["params"]["lines.dashed_pattern"]["comment"] == "The dash pattern of each line style\n\n- lines.dashed_pattern\n- lines.dotted_pattern"
+    assert index["params"]["lines.dotted_pattern"]["default"] == [1.0, 1.65]
+    assert index["errors"] == []
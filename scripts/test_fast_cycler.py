@@ -0,0 +1,54 @@
+import cycler as cycler_module
+import matplotlib.rcsetup as rcsetup
+import pytest
+
+from fast_cycler import ColumnarCycler, cycler, validate_cycler
+
+
+def test_iadd():
+    c = cycler(color=['r', 'g'])
+    c += cycler(lw=[1, 2])
+    assert c.keys == {'color', 'linewidth'}
+    assert c.by_key() == {'color': ['r', 'g'], 'linewidth': [1.0, 2.0]}
+    assert list(c) == list(rcsetup.cycler(color=['r', 'g']) + rcsetup.cycler(lw=[1, 2]))
+    assert validate_cycler(c) is c
+
+
+def test_imul():
+    c = cycler(color=['r', 'g'])
+    c *= cycler(linestyle=['-', '--'])
+    assert c.keys == {'color', 'linestyle'}
+    assert c.by_key() == rcsetup.validate_cycler("cycler(color=['r', 'g']) * cycler(linestyle=['-', '--'])").by_key()
+    assert len(c) == 4
+
+
+def test_iadd_unequal_length():
+    c = cycler(color=['r', 'g'])
+    with pytest.raises(ValueError):
+        c += cycler(lw=[1, 2, 3])
+
+
+def test_iadd_plain_cycler_is_validated_again():
+    c = cycler(color=['r', 'g'])
+    c += cycler_module.cycler('linewidth', ['bad', 'bad'])
+    assert not c.validated
+    with pytest.raises(ValueError):
+        validate_cycler(c)
+
+
+def test_change_key():
+    c = cycler(color=['r', 'g']) + cycler(lw=[1, 2])
+    c.change_key('linewidth', 'lw')
+    assert c.keys == {'color', 'lw'}
+    assert c.by_key() == {'color': ['r', 'g'], 'lw': [1.0, 2.0]}
+    assert list(c) == [{'color': 'r', 'lw': 1.0}, {'color': 'g', 'lw': 2.0}]
+    with pytest.raises(ValueError):
+        c.change_key('lw', 'color')
+    with pytest.raises(KeyError):
+        c.change_key('linestyle', 'ls')
+
+
+def test_repr():
+    c = validate_cycler("cycler(color=['r', 'g']) + cycler(lw=[1, 2])")
+    assert isinstance(c, ColumnarCycler)
+    assert repr(c) == "(cycler('color', ['r', 'g']) + cycler('linewidth', [1.0, 2.0]))"
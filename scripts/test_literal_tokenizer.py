@@ -0,0 +1,51 @@
+import itertools
+
+import matplotlib.rcsetup as rcsetup
+import numpy as np
+import pytest
+
+import literal_tokenizer
+
+names = ["validate_color", "_validate_linestyle", "validate_sketch"]
+if hasattr(rcsetup, "_validate_legend_loc"):
+    names.append("_validate_legend_loc")
+
+edge_inputs = [
+    "(\u0661, 0, 0)", "(\u0660, (\u0661, \u0662))", "(\u0660.5, \u0660.5)", "(1, 2, \uff13)",
+    "(0, 0, 0)\u00a0", "\u00a0(0, 0, 0)", "(0, 0, 0)\u3000", "(0, 0, 0)\v", "(0, 0, 0)\f", "(0, 0, 0)\r\n", " (0, 0, 0)",
+    "00", "(00, 0, 0)", "(01, 0, 0)", "(1_0, 0, 0)", "(0x10, 0, 0)", "(1e1, 0, 0)", "(1E-1, 0, 0)", "(.5, 5., 0)",
+    "()", "(1)", "(1,)", "(1, 2,)", "(1, 2, 3,)", "(1, 2, 3, 4,)", "(1,,)", "(,)", "[]", "[1, 2]", "(1, 2, 3",
+    "(0.5, 0.5)", "(0, 0, 0)", "(0.1, 0.2, 0.3, 0.5)", "(-1, 0, 0)", "(+1, 0, 0)", "(--1, 0, 0)",
+    "(0, (1, 2))", "(0, [1, 2])", "(0, (1, 2,))", "(0, ())", "(0, (1,))", "(0, (-1, 2))", "(0.5, (1, 0))", "(None, (1, 2))",
+    "(1, 100, 2)", "1, 100, 2", "(1, 100)", "None", "none", " ( 1 , 2 , 3 ) ", "\t(1, 2, 3)\n", "",
+]
+
+
+def outcome(validator, value):
+    try:
+        result = validator(value)
+    except Exception as err:
+        return "error", type(err).__name__, str(err)
+    if isinstance(result, np.ndarray):
+        result = result.tolist()
+    return "ok", type(result).__name__, repr(result)
+
+
+@pytest.mark.parametrize("name", names)
+@pytest.mark.parametrize("value", edge_inputs)
+def test_edge_inputs(name, value):
+    assert outcome(getattr(literal_tokenizer, name), value) == outcome(getattr(rcsetup, name), value)
+
+
+@pytest.mark.parametrize("name", names)
+def test_generated_inputs(name):
+    atoms = ["0", "1", "0.5", "-1", "1e1", "00", "1_0", "\u0662", ",", "(", ")", " "]
+    for parts in itertools.product(atoms, repeat=4):
+        value = "(" + "".join(parts) + ")"
+        assert outcome(getattr(literal_tokenizer, name), value) == outcome(getattr(rcsetup, name), value), value
+
+
+def test_fast_validators():
+    table = literal_tokenizer.fast_validators()
+    assert table.keys() == rcsetup._validators.keys()
+    assert table["axes.facecolor"] is literal_tokenizer.validate_color
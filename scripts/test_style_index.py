@@ -0,0 +1,32 @@
+import numpy as np
+
+from style_index import StyleIndex
+
+
+def test_build(tmp_path):
+    styles = tmp_path / "styles"
+    styles.mkdir()
+    (styles / "a.mplstyle").write_text("axes.titley: None\nlegend.numpoints: 2\n")
+    (styles / "b.mplstyle").write_text("axes.titley: 1.05\nlegend.numpoints: 3\naxes.grid: yes\n")
+    (styles / "c.mplstyle").write_bytes(b"\xff\xfeaxes.grid: True\n")
+    (styles / "d.mplstyle").write_text("lines.linewidth: x\n")
+    index = StyleIndex.build(sorted(styles.glob("*.mplstyle")), max_workers=2)
+    index.save(tmp_path / "index")
+    index = StyleIndex.load(tmp_path / "index")
+
+    assert index.error_counts.tolist() == [0, 0, 1, 1]
+    titley = index.column("axes.titley")
+    assert titley.kind == "float"
+    assert titley.present.tolist() == [True, True, False, False]
+    assert index.files_where(titley.present & np.isnan(titley.values)) == [str(styles / "a.mplstyle")]
+    assert index.column("legend.numpoints").kind == "int"
+    assert index.column("axes.grid").values.tolist() == [False, True, False, False]
+
+
+def test_int_outside_int64(tmp_path):
+    (tmp_path / "a.mplstyle").write_text("legend.numpoints: 99999999999999999999999\n")
+    (tmp_path / "b.mplstyle").write_text("legend.numpoints: 3\n")
+    index = StyleIndex.build(sorted(tmp_path.glob("*.mplstyle")))
+    column = index.column("legend.numpoints")
+    assert column.kind == "category"
+    assert column.present.all()
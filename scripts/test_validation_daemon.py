@@ -0,0 +1,37 @@
+import json
+
+from validation_daemon import INTERNAL_ERROR, INVALID_PARAMS, PARSE_ERROR, handle
+
+
+def request(method, params, id=1):
+    return json.dumps({"jsonrpc": "2.0", "id": id, "method": method, "params": params})
+
+
+def test_validate():
+    assert handle(request("validate", ["lines.linewidth", "2"]))["result"] == {"valid": True, "value": "2.0"}
+    assert handle(request("validate", {"key": "lines.linewidth", "value": "x"}))["result"]["valid"] is False
+
+
+def test_parse_error():
+    assert handle("{")["error"]["code"] == PARSE_ERROR
+    assert handle("[" * 100000)["error"]["code"] == PARSE_ERROR
+
+
+def test_invalid_params():
+    assert handle(request("validateDocument", {"text": 5}))["error"]["code"] == INVALID_PARAMS
+    assert handle(request("validate", {"key": "a"}))["error"]["code"] == INVALID_PARAMS
+    assert handle(request("listKeys", 5))["error"]["code"] == INVALID_PARAMS
+
+
+def test_internal_error(monkeypatch):
+    import validation_daemon
+
+    def fail(text):
+        raise AttributeError("bug")
+    monkeypatch.setitem(validation_daemon.methods, "validateDocument", fail)
+    assert handle(request("validateDocument", {"text": ""}))["error"]["code"] == INTERNAL_ERROR
+    assert "result" in handle(request("listKeys", []))
+
+
+def test_notification():
+    assert handle(json.dumps({"jsonrpc": "2.0", "method": "listKeys"})) is None
@@ -1,6 +1,8 @@
+import hashlib
 import json
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import matplotlib.colors
 try:
@@ -10,12 +12,49 @@ except ImportError:
     # matplotlib > v3.5.2 https://github.com/matplotlib/matplotlib/commit/fb902f735995372f345a8333804f5c6052f29770
     from matplotlib.cm import _colormaps as _cmap_registry  # type: ignore
 
+from color_table import pack_color_table
+from colormap_lut import pack_colormap_luts
 
-def json_dump_compact(obj: Any):
-    # https://stackoverflow.com/a/29066406/10710682
-    # https://stackoverflow.com/a/16311587/10710682
-    return json.dumps(json.loads(json.dumps(obj), parse_float=lambda x: round(float(x), 3)), separators=(',', ':'))
 
+def iter_json_compact(obj: Any, ndigits: int = 3) -> Iterator[str]:
+    """Encodes `obj` as compact JSON in a single pass, with sorted object keys and floats rounded to `ndigits`."""
+    if isinstance(obj, float):
+        yield json.dumps(round(obj, ndigits))
+    elif isinstance(obj, dict):
+        yield "{"
+        for i, k in enumerate(sorted(obj)):
+            if i > 0:
+                yield ","
+            yield json.dumps(k)
+            yield ":"
+            yield from iter_json_compact(obj[k], ndigits)
+        yield "}"
+    elif isinstance(obj, (list, tuple)):
+        yield "["
+        for i, v in enumerate(obj):
+            if i > 0:
+                yield ","
+            yield from iter_json_compact(v, ndigits)
+        yield "]"
+    else:
+        yield json.dumps(obj)
 
-(Path(__file__).parent.parent / "matplotlib" / "colors.json").write_text(json_dump_compact({k: [x for x in matplotlib.colors.to_rgba(v)] for k, v in matplotlib.colors.get_named_colors_mapping().items()}))
-(Path(__file__).parent.parent / "matplotlib" / "cm.json").write_text(json_dump_compact(list(_cmap_registry.keys())))
+
+def write_if_changed(path: Path, data: bytes):
+    """Writes `data` to `path` unless the file already has the same content. Returns whether the file was written."""
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+        return False
+    path.write_bytes(data)
+    return True
+
+
+out_dir = Path(__file__).parent.parent / "matplotlib"
+colors = {k: matplotlib.colors.to_rgba(v) for k, v in matplotlib.colors.get_named_colors_mapping().items()}
+
+for name, data in (
+    ("colors.json", "".join(iter_json_compact(colors)).encode()),
+    ("colors.bin", pack_color_table(colors)),
+    ("cm.json", "".join(iter_json_compact(list(_cmap_registry.keys()))).encode()),
+    ("cm_lut.json", pack_colormap_luts(_cmap_registry).encode()),
+):
+    print(f"{name}: {'updated' if write_if_changed(out_dir / name, data) else 'unchanged'}", file=sys.stderr)
@@ -0,0 +1,106 @@
+"""Answers validation requests with matplotlib's own validators over newline-delimited JSON-RPC 2.0 on stdio.
+
+Methods:
+    validate(key, value)     -> {"valid": true, "value": "<repr of the validated value>"} or {"valid": false, "error": "..."}
+    validateDocument(text)   -> {"errors": [{"line": <1-based line number>, "key": "..." | null, "message": "..."}]}
+    listKeys()               -> ["<rc key>", ...]
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import sys
+from typing import Any, Callable
+
+from literal_tokenizer import fast_validators
+from style_validation import Entry, validate_entry, validate_style
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# The editor sends the same lines over and over, which the cached parsers of `literal_tokenizer` answer without `ast`
+validators = fast_validators()
+
+
+def validate(key: str, value: str):
+    validated, error = validate_entry(Entry(0, key, value), validators)
+    if error is not None:
+        return {"valid": False, "error": error.message}
+    return {"valid": True, "value": repr(validated)}
+
+
+def validate_document(text: str):
+    return {"errors": [{"line": e.line_no, "key": e.key, "message": e.message} for e in validate_style(text, validators).errors]}
+
+
+def list_keys():
+    return sorted(validators)
+
+
+methods: dict[str, Callable[..., Any]] = {
+    "validate": validate,
+    "validateDocument": validate_document,
+    "listKeys": list_keys,
+}
+
+
+def _bind(method: Callable[..., Any], params: Any):
+    """Binds the params to the arguments of `method`, all of which are strings. Raises TypeError if they do not match."""
+    if isinstance(params, list):
+        bound = inspect.signature(method).bind(*params)
+    elif isinstance(params, dict):
+        bound = inspect.signature(method).bind(**params)
+    else:
+        raise TypeError("params must be an array or an object")
+    for name, value in bound.arguments.items():
+        if not isinstance(value, str):
+            raise TypeError(f"{name} must be a string")
+    return bound
+
+
+def handle(line: str) -> dict[str, Any] | None:
+    """Returns the response to a request, or None for a notification."""
+    try:
+        request = json.loads(line)
+    except (ValueError, RecursionError) as err:
+        # RecursionError for deeply nested arrays or objects
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(err)}}
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return {"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Invalid Request"}}
+
+    request_id = request.get("id")
+    method = methods.get(request["method"])
+    params = request.get("params", {})
+    if method is None:
+        response = {"error": {"code": METHOD_NOT_FOUND, "message": f"Method not found: {request['method']}"}}
+    else:
+        try:
+            bound = _bind(method, params)
+        except TypeError as err:
+            response = {"error": {"code": INVALID_PARAMS, "message": str(err)}}
+        else:
+            try:
+                response = {"result": method(*bound.args, **bound.kwargs)}
+            except Exception as err:
+                # The daemon is long-lived, so a bug in a method must not end it
+                response = {"error": {"code": INTERNAL_ERROR, "message": f"{type(err).__name__}: {err}"}}
+    if "id" not in request:
+        return None
+    return {"jsonrpc": "2.0", "id": request_id, **response}
+
+
+def main():
+    for line in sys.stdin:
+        if line.strip() == "":
+            continue
+        response = handle(line)
+        if response is not None:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
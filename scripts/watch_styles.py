@@ -0,0 +1,165 @@
+"""Watches a directory of .mplstyle and matplotlibrc files and revalidates them as they are saved.
+
+The directory is polled for changes to the modification times and sizes of the files, and a burst of writes is
+validated once after the files have been quiet for the debounce interval. Only the changed files are read again, and
+the `key: value` pairs that were already validated in any file are answered from an in-memory cache.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from literal_tokenizer import fast_validators
+from style_validation import Entry, StyleError, ValidationResult, Validators, _validators, parse_style, validate_entry
+
+
+def is_style_file(path: Path):
+    return path.suffix == ".mplstyle" or path.name == "matplotlibrc"
+
+
+class EntryCache:
+    """An LRU cache of validation results keyed by the key and the raw value of a line.
+
+    Cached values are shared between the files that contain the same line, so they must not be mutated.
+    """
+
+    def __init__(self, maxsize: int, validators: Validators = _validators):
+        self.maxsize = maxsize
+        self.validators = validators
+        self.entries: OrderedDict[tuple[str, str], tuple[Any, str | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, entry: Entry) -> tuple[Any, StyleError | None]:
+        cache_key = (entry.key, entry.value)
+        cached = self.entries.get(cache_key)
+        if cached is not None:
+            self.hits += 1
+            self.entries.move_to_end(cache_key)
+            value, message = cached
+        else:
+            self.misses += 1
+            value, error = validate_entry(entry, self.validators)
+            message = None if error is None else error.message
+            self.entries[cache_key] = (value, message)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return value, None if message is None else StyleError(entry.line_no, entry.key, message)
+
+    def validate_style(self, text: str):
+        """Same as `style_validation.validate_style`, with the cache."""
+        entries, errors = parse_style(text)
+        result = ValidationResult()
+        for entry in {e.key: e for e in entries}.values():
+            value, error = self.validate(entry)
+            if error is None:
+                result.params[entry.key] = value
+            else:
+                result.errors.append(error)
+        result.errors = sorted(errors + result.errors, key=lambda e: e.line_no)
+        return result
+
+
+Snapshot = dict[Path, tuple[int, int]]
+
+
+def scan(root: Path) -> Snapshot:
+    """The modification time and the size of each style file under `root`."""
+    snapshot: Snapshot = {}
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        if not e.name.startswith("."):
+                            stack.append(Path(e.path))
+                    elif is_style_file(Path(e.path)):
+                        st = e.stat()
+                        snapshot[Path(e.path)] = (st.st_mtime_ns, st.st_size)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+    return snapshot
+
+
+class StyleWatcher:
+    def __init__(self, root: Path, interval: float = 0.25, debounce: float = 0.3, cache: EntryCache | None = None):
+        self.root = root
+        self.interval = interval
+        """Seconds between polls"""
+        self.debounce = debounce
+        """Seconds without further changes before the changed files are validated"""
+        self.cache = cache if cache is not None else EntryCache(65536, fast_validators())
+        self.snapshot: Snapshot = {}
+
+    def changes(self) -> set[Path]:
+        """Updates the snapshot and returns the files that were added, modified or removed since the last call."""
+        snapshot = scan(self.root)
+        changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+        self.snapshot = snapshot
+        return changed
+
+    def validate(self, paths: set[Path]) -> Iterator[tuple[Path, ValidationResult | None]]:
+        """Yields the result for each file, or None if the file was removed."""
+        for path in sorted(paths):
+            try:
+                text = path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                yield path, None
+                continue
+            except (OSError, UnicodeDecodeError) as err:
+                yield path, ValidationResult(errors=[StyleError(0, None, str(err))])
+                continue
+            yield path, self.cache.validate_style(text)
+
+    def run(self, on_result: Callable[[Path, ValidationResult | None], None], initial: bool = True):
+        """Polls until interrupted. If `initial` is true, every file is validated once at the start."""
+        pending = self.changes()
+        if not initial:
+            pending = set()
+        last_change = 0.0
+        while True:
+            changed = self.changes()
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            if pending and time.monotonic() - last_change >= self.debounce:
+                for path, result in self.validate(pending):
+                    on_result(path, result)
+                pending = set()
+            time.sleep(self.interval)
+
+
+def print_result(path: Path, result: ValidationResult | None):
+    if result is None:
+        print(f"{path}: removed")
+    elif not result.errors:
+        print(f"{path}: ok")
+    for error in result.errors if result is not None else []:
+        print(f"{path}:{error.line_no}: {error.message}")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watches a directory of .mplstyle and matplotlibrc files and prints the validation errors of the files as they change.")
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between polls (default: %(default)s)")
+    parser.add_argument("--debounce", type=float, default=0.3, help="seconds to wait for a burst of writes to end (default: %(default)s)")
+    parser.add_argument("--cache-size", type=int, default=65536, help="maximum number of cached lines (default: %(default)s)")
+    parser.add_argument("--no-initial", action="store_true", help="do not validate the existing files at startup")
+    args = parser.parse_args()
+
+    watcher = StyleWatcher(args.directory, args.interval, args.debounce, EntryCache(args.cache_size, fast_validators()))
+    try:
+        watcher.run(print_result, initial=not args.no_initial)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()